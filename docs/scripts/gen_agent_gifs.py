@@ -99,13 +99,22 @@ def gen_agent_gif(
         return
 
     # obtain and save length frames worth of steps
+    # frames are resized as they are rendered, so full size frames aren't kept
     frames = []
+    size = None
+    repeat = int(60 / env.metadata["render_fps"]) if env_type == "classic" else 1
     obs, _ = env.reset()
     while len(frames) <= length:
         frame = env.render()  # type: ignore
-        repeat = int(60 / env.metadata["render_fps"]) if env_type == "classic" else 1
+        img = Image.fromarray(frame)
+        if resize:
+            if size is None:
+                # h / w = H / w'
+                # w' = Hw/h
+                size = (HEIGHT * img.width // img.height, HEIGHT)
+            img = img.resize(size)
         for _ in range(repeat):
-            frames.append(Image.fromarray(frame))
+            frames.append(img)
 
         actions: Dict[str, Any] = {}
         for i in env.agents:
@@ -122,13 +131,6 @@ def gen_agent_gif(
 
     env.close()
 
-    if resize:
-        for idx, img in enumerate(frames):
-            # h / w = H / w'
-            # w' = Hw/h
-            resized_img = img.resize((HEIGHT, int(HEIGHT * img.width / img.height)))
-            frames[idx] = resized_img
-
     frames[0].save(
         v_file_path,
         save_all=True,
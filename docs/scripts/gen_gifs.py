@@ -6,9 +6,14 @@ https://github.com/Farama-Foundation/Gymnasium/blob/v0.27.0/docs/scripts/gen_gif
 """
 
 import argparse
+import functools
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Callable, Optional, Sequence, Tuple, Union
 
+import numpy as np
 import posggym
 from PIL import Image
 from tqdm import tqdm
@@ -27,6 +32,52 @@ LENGTH = 300
 HEIGHT = 256
 
 
+def save_gif(file_path: Path, frames: np.ndarray, durations: Sequence[int]):
+    """Save (N, H, W, 3) frames as a GIF, showing frame i for `durations[i]` ms.
+
+    Uses libvips (via pyvips) if installed, otherwise falls back to Pillow.
+    """
+    try:
+        import pyvips
+    except (ImportError, OSError):
+        pyvips = None
+
+    if pyvips is not None:
+        # libvips represents an animation as one tall image of stacked frames
+        num_frames, height, width, bands = frames.shape
+        vips_img = pyvips.Image.new_from_memory(
+            np.ascontiguousarray(frames).data,
+            width,
+            height * num_frames,
+            bands,
+            "uchar",
+        ).copy()
+        vips_img.set_type(pyvips.GValue.gint_type, "page-height", height)
+        vips_img.set_type(pyvips.GValue.array_int_type, "delay", list(durations))
+        vips_img.set_type(pyvips.GValue.gint_type, "loop", 0)
+        # reuse=True encodes all frames with a single palette
+        vips_img.gifsave(
+            str(file_path), effort=3, bitdepth=8, interframe_maxerror=2.0, reuse=True
+        )
+        return
+
+    # quantize all frames using the palette of the first frame, rather than letting
+    # Pillow quantize each frame independently when saving
+    images = [Image.fromarray(frame) for frame in frames]
+    palette_img = images[0].quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+    images = [
+        img.quantize(palette=palette_img, dither=Image.Dither.NONE) for img in images
+    ]
+    images[0].save(
+        file_path,
+        save_all=True,
+        append_images=images[1:],
+        duration=list(durations),
+        loop=0,
+        optimize=False,
+    )
+
+
 def gen_gif(
     env_id: str,
     ignore_existing: bool = False,
@@ -61,43 +112,80 @@ def gen_gif(
         )
         return
 
-    # obtain and save LENGTH frames worth of steps
-    frames = []
-    while True:
+    repeat = int(60 / env.metadata["render_fps"]) if env_type == "classic" else 1
+
+    # obtain and save LENGTH frames worth of steps, written directly into a
+    # preallocated (num_frames, H, W, 3) buffer. Each rendered frame is stored once
+    # and displayed for `repeat` frames worth of time, rather than being duplicated
+    max_frames = -(-LENGTH // repeat)
+    frames = None
+    durations = []
+    length = 0
+    while length < LENGTH:
         env.reset()
         done = False
-        while not done and len(frames) <= LENGTH:
+        while not done and length < LENGTH:
             frame = env.render()  # type: ignore
-            repeat = (
-                int(60 / env.metadata["render_fps"]) if env_type == "classic" else 1
-            )
-            for i in range(repeat):
-                frames.append(Image.fromarray(frame))
+            if frames is None:
+                frame_h, frame_w = frame.shape[:2]
+                # all frames are the same size, so a single image is reused for
+                # resizing every frame
+                src_img = Image.new("RGB", (frame_w, frame_h))
+                if resize:
+                    # h / w = H / w'
+                    # w' = Hw/h
+                    frame_h, frame_w = HEIGHT, HEIGHT * frame.shape[1] // frame.shape[0]
+                frames = np.empty((max_frames, frame_h, frame_w, 3), dtype=np.uint8)
+
+            img = np.ascontiguousarray(frame[..., :3])
+            if resize:
+                src_img.frombytes(img.tobytes())
+                img = np.asarray(src_img.resize((frame_w, frame_h), Image.BILINEAR))
+            frames[len(durations)] = img
+            frame_repeat = min(repeat, LENGTH - length)
+            durations.append(50 * frame_repeat)
+            length += frame_repeat
+
             action = {i: env.action_spaces[i].sample() for i in env.agents}
             _, _, _, _, done, _ = env.step(action)
 
-        if len(frames) > LENGTH:
-            break
-
     env.close()
 
-    if resize:
-        for i, img in enumerate(frames):
-            # h / w = H / w'
-            # w' = Hw/h
-            resized_img = img.resize((HEIGHT, int(HEIGHT * img.width / img.height)))
-            frames[i] = resized_img
+    save_gif(v_file_path, frames[: len(durations)], durations)
+    try:
+        from pygifsicle import optimize
 
-    frames[0].save(
-        v_file_path,
-        save_all=True,
-        append_images=frames[1:],
-        duration=50,
-        loop=0,
-    )
+        optimize(v_file_path)
+    except ImportError:
+        # gifsicle optimization is optional
+        pass
     print(f"Saved: {env_name} to {v_file_path}")
 
 
+@functools.lru_cache(maxsize=None)
+def _render_modes(entry_point: Union[Callable, str]) -> Tuple[str, ...]:
+    """Get render modes of env class from it's metadata, without creating the env."""
+    # try catch in case missing some installs
+    try:
+        env_creator = (
+            entry_point
+            if callable(entry_point)
+            else posggym.envs.registration.load(entry_point)
+        )
+    except BaseException:
+        return ()
+    return tuple(getattr(env_creator, "metadata", {}).get("render_modes", ()))
+
+
+def _work(env_id: str, ignore_existing: bool) -> Optional[Tuple[str, str]]:
+    """Gen gif for env, returning (env_id, error) if gif couldn't be generated."""
+    try:
+        gen_gif(env_id, ignore_existing)
+    except BaseException as e:
+        return env_id, repr(e)
+    return None
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         formatter_class=argparse.ArgumentDefaultsHelpFormatter
@@ -116,19 +204,20 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     if args.env_id is None:
-        # iterate through all envspecs
-        for env_spec in tqdm(posggym.envs.registry.values()):
-            if any(x in str(env_spec.id) for x in kill_strs):
-                continue
-            # try catch in case missing some installs
-            try:
-                env = posggym.make(env_spec.id, disable_env_checker=True)
-                # the gymnasium needs to be rgb renderable
-                if "rgb_array" not in env.metadata["render_modes"]:
-                    continue
-                gen_gif(env_spec.id, args.ignore_existing)
-            except BaseException as e:
-                print(f"{env_spec.id} ERROR", e)
-                continue
+        # generate gifs for all envspecs in parallel, each env is independent
+        # the env needs to be rgb renderable
+        env_ids = [
+            env_spec.id
+            for env_spec in posggym.envs.registry.values()
+            if not any(x in str(env_spec.id) for x in kill_strs)
+            and "rgb_array" in _render_modes(env_spec.entry_point)
+        ]
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            results = executor.map(
+                _work, env_ids, [args.ignore_existing] * len(env_ids)
+            )
+            for result in tqdm(results, total=len(env_ids)):
+                if result is not None:
+                    print(f"{result[0]} ERROR", result[1])
     else:
         gen_gif(args.env_id, args.ignore_existing)
@@ -0,0 +1,72 @@
+"""Compiled kernels for the Level-Based Foraging heuristic policies.
+
+The kernels are compiled with `numba <https://numba.pydata.org/>`_ when it is
+installed. ``NUMBA_AVAILABLE`` is ``False`` otherwise, in which case the heuristic
+policies fall back to equivalent NumPy implementations.
+"""
+import numpy as np
+
+
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Leave functions uncompiled when numba isn't installed."""
+        return lambda fn: fn
+
+
+def _select_food(
+    agent_y: int,
+    agent_x: int,
+    food_arr: np.ndarray,
+    max_level: int,
+    closest: bool,
+    out: np.ndarray,
+) -> int:
+    """Select food by squared distance from (agent_y, agent_x).
+
+    Arguments
+    ---------
+    agent_y, agent_x : int
+        The position to measure distances from.
+    food_arr : np.ndarray
+        ``(num_food, 3)`` int array of (y, x, level) food triplets. Foods with
+        ``x == -1`` are not visible.
+    max_level : int
+        Max level of food to consider, or ``-1`` to consider food of any level.
+    closest : bool
+        Whether to select the closest (``True``) or furthest (``False``) food.
+    out : np.ndarray
+        ``(num_food,)`` int array, the first entries of which are set to the indices
+        (in ``food_arr`` order) of the foods tied at the selected distance.
+
+    Returns
+    -------
+    num_selected : int
+        The number of foods tied at the selected distance, ``0`` if no food is
+        visible.
+
+    """
+    best_dist = -1
+    num_best = 0
+    for i in range(food_arr.shape[0]):
+        if food_arr[i, 1] == -1 or (max_level >= 0 and food_arr[i, 2] > max_level):
+            continue
+        dy = food_arr[i, 0] - agent_y
+        dx = food_arr[i, 1] - agent_x
+        dist = dy * dy + dx * dx
+        if num_best == 0 or (dist < best_dist if closest else dist > best_dist):
+            best_dist = dist
+            num_best = 1
+            out[0] = i
+        elif dist == best_dist:
+            out[num_best] = i
+            num_best += 1
+    return num_best
+
+
+select_food = njit(cache=True)(_select_food)
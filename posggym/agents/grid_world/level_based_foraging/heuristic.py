@@ -8,8 +8,18 @@ https://github.com/uoe-agents/BRDiv/blob/master/envs/lb-foraging/lbforaging/agen
 from __future__ import annotations
 
 import random
-from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, cast
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    FrozenSet,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
 
+from posggym.agents.grid_world.level_based_foraging import _fast
 from posggym.agents.policy import Policy, PolicyID, PolicyState
 from posggym.agents.utils import action_distributions
 from posggym.envs.grid_world.level_based_foraging import (
@@ -17,11 +27,40 @@ from posggym.envs.grid_world.level_based_foraging import (
     LBFObs,
     LevelBasedForagingModel,
 )
+from posggym.utils import seeding
 
 if TYPE_CHECKING:
     from posggym.envs.grid_world.core import Coord
 
 
+_ALL_LBF_ACTIONS: Tuple[LBFAction, ...] = tuple(LBFAction)
+_LOAD_LIST: Tuple[LBFAction, ...] = (LBFAction.LOAD,)
+
+# Actions that move towards target, keyed by sign of (dy, dx) offset to the target.
+# Note positioning is relative to observing agents observation grid, not the
+# global grid. So relative directions are different.
+_MOVE_TABLE: Dict[Tuple[int, int], Tuple[LBFAction, ...]] = {
+    (-1, -1): (LBFAction.WEST, LBFAction.NORTH),
+    (-1, 0): (LBFAction.WEST,),
+    (-1, 1): (LBFAction.WEST, LBFAction.SOUTH),
+    (0, -1): (LBFAction.NORTH,),
+    (0, 0): (LBFAction.NONE,),
+    (0, 1): (LBFAction.SOUTH,),
+    (1, -1): (LBFAction.EAST, LBFAction.NORTH),
+    (1, 0): (LBFAction.EAST,),
+    (1, 1): (LBFAction.EAST, LBFAction.SOUTH),
+}
+
+# Change in relative (y, x) position of a target after agent performs action.
+# NONE and LOAD leave relative positions unchanged.
+_DELTA: Dict[LBFAction, Tuple[int, int]] = {
+    LBFAction.NORTH: (0, 1),
+    LBFAction.SOUTH: (0, -1),
+    LBFAction.EAST: (-1, 0),
+    LBFAction.WEST: (1, 0),
+}
+
+
 class LBFHeuristicPolicy(Policy[LBFAction, LBFObs]):
     """Heuristic agent for the Level-Based Foraging env.
 
@@ -35,17 +74,37 @@ class LBFHeuristicPolicy(Policy[LBFAction, LBFObs]):
         super().__init__(model, agent_id, policy_id)
         assert model.observation_mode in ("vector", "tuple")
         self._rng = random.Random()
+        self._randrange = self._rng.randrange
+        # used for sampling batches of actions
+        self._np_rng, _ = seeding.np_random()
+        # uniform distributions over each set of possible actions
+        self._pi_cache: Dict[
+            Tuple[LBFAction, ...], action_distributions.DiscreteActionDistribution
+        ] = {}
+        self._num_agents = len(model.possible_agents)
+        self._obs_len = 3 * (self._num_agents + model.max_food)
+        # indices of the foods tied when selecting food by distance
+        self._food_candidates = np.empty(model.max_food, dtype=np.int64)
+        # last tuple observation parsed and its parsed form, so repeated calls with
+        # the same obs object don't re-parse it. A reference to the obs is kept so its
+        # id can't be reused by a different object. Only (immutable) tuple obs are
+        # cached, since array obs may be updated in place by the caller.
+        self._parsed_obs_cache: Optional[
+            Tuple[LBFObs, Tuple[np.ndarray, np.ndarray]]
+        ] = None
 
     def reset(self, *, seed: int | None = None):
         super().reset(seed=seed)
         if seed is not None:
             self._rng.seed(seed)
+            self._np_rng, _ = seeding.np_random(seed=seed)
 
     def get_initial_state(self) -> PolicyState:
         state = super().get_initial_state()
         state["last_obs"] = None
         state["agent_pos"] = None
         state["target_pos"] = None
+        state["possible_actions"] = _ALL_LBF_ACTIONS
         return state
 
     def get_next_state(
@@ -54,113 +113,189 @@ class LBFHeuristicPolicy(Policy[LBFAction, LBFObs]):
         obs: LBFObs,
         state: PolicyState,
     ) -> PolicyState:
-        model = cast(LevelBasedForagingModel, self.model)
-        agent_obs, food_obs = model.parse_obs(obs)
-        other_agent_obs = [o for o in agent_obs[1:] if o[0] > -1]
+        agent_obs, food_obs = self._parse_obs(obs)
+        other_agent_obs = agent_obs[1:][agent_obs[1:, 0] > -1]
+        food_coords = frozenset(map(tuple, food_obs[food_obs[:, 1] != -1, :2].tolist()))
+        agent_pos = tuple(agent_obs[0, :2].tolist())
+        target_pos = self._get_target_pos(
+            agent_obs[0],
+            food_obs,
+            food_coords,
+            other_agent_obs,
+            action,
+            state["target_pos"],
+        )
+        if target_pos is None:
+            possible_actions = _ALL_LBF_ACTIONS
+        else:
+            possible_actions = self._move_towards(
+                agent_pos, target_pos, load_if_adjacent=True
+            )
         return {
             "last_obs": obs,
-            "agent_pos": agent_obs[0][:2],
-            "target_pos": self._get_target_pos(
-                agent_obs[0], food_obs, other_agent_obs, action, state["target_pos"]
-            ),
+            "agent_pos": agent_pos,
+            "target_pos": target_pos,
+            "possible_actions": possible_actions,
         }
 
     def sample_action(self, state: PolicyState) -> LBFAction:
+        # sample via the distribution, so the RNG is used the same as by get_pi
         return self.get_pi(state).sample()
 
+    def sample_action_batch(self, states: Sequence[PolicyState]) -> np.ndarray:
+        """Sample an action for each policy state in a batch.
+
+        Samples from the same distribution as calling :meth:`sample_action` on each
+        state, but selects the actions for the whole batch using vectorized
+        operations. Useful when stepping the same policy across many vectorized
+        environments.
+
+        Arguments
+        ---------
+        states : Sequence[PolicyState]
+            The policy states, one for each environment in the batch.
+
+        Returns
+        -------
+        actions : np.ndarray
+            The sampled ``LBFAction`` values, with shape ``(len(states),)``.
+
+        """
+        num_states = len(states)
+        has_target = np.fromiter(
+            (s["target_pos"] is not None for s in states), dtype=bool, count=num_states
+        )
+        offsets = np.zeros((num_states, 2), dtype=np.int64)
+        target_idxs = np.flatnonzero(has_target)
+        if len(target_idxs):
+            offsets[target_idxs] = np.array(
+                [states[i]["target_pos"] for i in target_idxs]
+            ) - np.array([states[i]["agent_pos"] for i in target_idxs])
+        dy, dx = offsets[:, 0], offsets[:, 1]
+
+        # see _MOVE_TABLE, -1 means no move needed along that axis
+        y_action = np.select([dy < 0, dy > 0], [LBFAction.WEST, LBFAction.EAST], -1)
+        x_action = np.select([dx > 0, dx < 0], [LBFAction.SOUTH, LBFAction.NORTH], -1)
+        u = self._np_rng.random(num_states)
+        actions = np.where(
+            (y_action == -1) | ((x_action != -1) & (u < 0.5)), x_action, y_action
+        )
+        actions[actions == -1] = LBFAction.NONE
+        actions[np.abs(dy) + np.abs(dx) == 1] = LBFAction.LOAD
+        actions[~has_target] = (u[~has_target] * len(_ALL_LBF_ACTIONS)).astype(np.int64)
+        return actions
+
     def get_pi(self, state: PolicyState) -> action_distributions.ActionDistribution:
-        if state["target_pos"] is None:
-            possible_actions = list(LBFAction)
-        else:
-            possible_actions = self._move_towards(
-                state["agent_pos"], state["target_pos"], load_if_adjacent=True
+        key = tuple(state["possible_actions"])
+        pi = self._pi_cache.get(key)
+        if pi is None:
+            pi = action_distributions.DiscreteActionDistribution(
+                {a: 1 / len(key) for a in key}, self._rng
             )
-        return action_distributions.DiscreteActionDistribution(
-            {a: 1 / len(possible_actions) for a in possible_actions}, self._rng
-        )
+            self._pi_cache[key] = pi
+        return pi
 
     def get_value(self, state: PolicyState) -> float:
         raise NotImplementedError(
             f"`get_value()` no implemented by {self.__class__.__name__} policy"
         )
 
+    def _parse_obs(self, obs: LBFObs) -> Tuple[np.ndarray, np.ndarray]:
+        """Parse obs into arrays of (y, x, level) agent and food triplets.
+
+        Equivalent to ``model.parse_obs`` except the triplets are returned as rows of
+        ``(num_agents, 3)`` and ``(max_food, 3)`` int arrays.
+        """
+        if self._parsed_obs_cache is not None and self._parsed_obs_cache[0] is obs:
+            return self._parsed_obs_cache[1]
+        assert len(obs) == self._obs_len
+        # always copy, so the parsed obs never shares memory with the caller's obs
+        obs_arr = np.array(obs, dtype=np.int32).reshape(-1, 3)
+        parsed_obs = (obs_arr[: self._num_agents], obs_arr[self._num_agents :])
+        if isinstance(obs, tuple):
+            self._parsed_obs_cache = (obs, parsed_obs)
+        return parsed_obs
+
     def _get_target_pos(
         self,
-        agent_obs: Tuple[int, int, int],
-        food_obs: List[Tuple[int, int, int]],
-        other_agent_obs: List[Tuple[int, int, int]],
+        agent_obs: np.ndarray,
+        food_obs: np.ndarray,
+        food_coords: FrozenSet[Coord],
+        other_agent_obs: np.ndarray,
         last_action: LBFAction,
         target_pos: Optional[Coord],
     ) -> Optional[Coord]:
-        """Get target position from observations."""
+        """Get target position from observations.
+
+        `agent_obs` is the (y, x, level) of the observing agent, while `food_obs` and
+        `other_agent_obs` are arrays with a (y, x, level) row for each food and visible
+        other agent, respectively. `food_coords` is the set of coords of all visible
+        food in `food_obs`.
+        """
         raise NotImplementedError
 
     def _get_food_by_distance(
         self,
         agent_pos: Coord,
-        food_obs: List[Tuple[int, int, int]],
+        food_obs: np.ndarray,
         closest: bool = True,
         max_food_level: Optional[int] = None,
     ) -> Optional[Coord]:
-        food_distances: Dict[int, List[Coord]] = {}
-        for y, x, level in food_obs:
-            if x == -1 or (max_food_level is not None and level > max_food_level):
-                continue
-            distance = (agent_pos[0] - y) ** 2 + (agent_pos[1] - x) ** 2
-            if distance not in food_distances:
-                food_distances[distance] = []
-            food_distances[distance].append((y, x))
-
-        if len(food_distances) == 0:
+        if _fast.NUMBA_AVAILABLE:
+            num_candidates = _fast.select_food(
+                int(agent_pos[0]),
+                int(agent_pos[1]),
+                food_obs,
+                -1 if max_food_level is None else int(max_food_level),
+                closest,
+                self._food_candidates,
+            )
+            candidates = self._food_candidates[:num_candidates]
+        else:
+            mask = food_obs[:, 1] != -1
+            if max_food_level is not None:
+                mask &= food_obs[:, 2] <= max_food_level
+            candidates = self._food_candidates[:0]
+            if mask.any():
+                dy = food_obs[:, 0] - agent_pos[0]
+                dx = food_obs[:, 1] - agent_pos[1]
+                dist = dy * dy + dx * dx
+                desired_dist = dist[mask].min() if closest else dist[mask].max()
+                candidates = np.flatnonzero(mask & (dist == desired_dist))
+
+        if len(candidates) == 0:
             # No food in sight
             return None
+        # consumes the RNG the same as random.choice, even if there is no tie
+        idx = candidates[self._randrange(len(candidates))]
+        return int(food_obs[idx, 0]), int(food_obs[idx, 1])
 
-        desired_dist = min(food_distances) if closest else max(food_distances)
-        return self._rng.choice(food_distances[desired_dist])
-
-    def _center_of_agents(self, agent_obs: List[Tuple[int, int, int]]) -> Coord:
-        y_mean = sum(o[0] for o in agent_obs) / len(agent_obs)
-        x_mean = sum(o[1] for o in agent_obs) / len(agent_obs)
-        return round(x_mean), round(y_mean)
+    def _get_food_by_center_distance(
+        self,
+        agent_obs: np.ndarray,
+        food_obs: np.ndarray,
+        closest: bool = True,
+        max_food_level: Optional[int] = None,
+    ) -> Optional[Coord]:
+        """Get food by distance from the center of the given agents."""
+        y_mean, x_mean = agent_obs[:, :2].mean(axis=0).tolist()
+        return self._get_food_by_distance(
+            (round(x_mean), round(y_mean)), food_obs, closest, max_food_level
+        )
 
     def _move_towards(
         self, agent_pos: Coord, target: Coord, load_if_adjacent: bool = True
-    ) -> List[LBFAction]:
-        if (
-            load_if_adjacent
-            and abs(target[0] - agent_pos[0]) + abs(target[1] - agent_pos[1]) == 1
-        ):
-            return [LBFAction.LOAD]
-
-        valid_actions = []
-        # Note positioning is relative to observing agents observation grid, not the
-        # global grid. So relative directions are different.
-        if target[0] < agent_pos[0]:
-            valid_actions.append(LBFAction.WEST)
-        elif target[0] > agent_pos[0]:
-            valid_actions.append(LBFAction.EAST)
-
-        if target[1] > agent_pos[1]:
-            valid_actions.append(LBFAction.SOUTH)
-        elif target[1] < agent_pos[1]:
-            valid_actions.append(LBFAction.NORTH)
-
-        if not valid_actions:
-            valid_actions.append(LBFAction.NONE)
-        return valid_actions
+    ) -> Sequence[LBFAction]:
+        dy = target[0] - agent_pos[0]
+        dx = target[1] - agent_pos[1]
+        if load_if_adjacent and abs(dy) + abs(dx) == 1:
+            return _LOAD_LIST
+        return _MOVE_TABLE[((dy > 0) - (dy < 0), (dx > 0) - (dx < 0))]
 
     def _get_updated_pos(self, prev_pos: Coord, last_action: LBFAction) -> Coord:
         # Updates relative position based on last action
-        if last_action == LBFAction.NORTH:
-            return prev_pos[0], prev_pos[1] + 1
-        elif last_action == LBFAction.SOUTH:
-            return prev_pos[0], prev_pos[1] - 1
-        elif last_action == LBFAction.EAST:
-            return prev_pos[0] - 1, prev_pos[1]
-        elif last_action == LBFAction.WEST:
-            return prev_pos[0] + 1, prev_pos[1]
-        else:
-            return prev_pos
+        dy, dx = _DELTA.get(last_action, (0, 0))
+        return prev_pos[0] + dy, prev_pos[1] + dx
 
 
 class LBFHeuristic1(LBFHeuristicPolicy):
@@ -168,9 +303,10 @@ class LBFHeuristic1(LBFHeuristicPolicy):
 
     def _get_target_pos(
         self,
-        agent_obs: Tuple[int, int, int],
-        food_obs: List[Tuple[int, int, int]],
-        other_agent_obs: List[Tuple[int, int, int]],
+        agent_obs: np.ndarray,
+        food_obs: np.ndarray,
+        food_coords: FrozenSet[Coord],
+        other_agent_obs: np.ndarray,
         last_action: LBFAction,
         target_pos: Optional[Coord],
     ) -> Optional[Coord]:
@@ -187,18 +323,18 @@ class LBFHeuristic2(LBFHeuristicPolicy):
 
     def _get_target_pos(
         self,
-        agent_obs: Tuple[int, int, int],
-        food_obs: List[Tuple[int, int, int]],
-        other_agent_obs: List[Tuple[int, int, int]],
+        agent_obs: np.ndarray,
+        food_obs: np.ndarray,
+        food_coords: FrozenSet[Coord],
+        other_agent_obs: np.ndarray,
         last_action: LBFAction,
         target_pos: Optional[Coord],
     ) -> Optional[Coord]:
-        if not other_agent_obs:
+        if len(other_agent_obs) == 0:
             return None
 
-        center_pos = self._center_of_agents(other_agent_obs)
-        return self._get_food_by_distance(
-            center_pos, food_obs, closest=True, max_food_level=None
+        return self._get_food_by_center_distance(
+            other_agent_obs, food_obs, closest=True, max_food_level=None
         )
 
 
@@ -207,9 +343,10 @@ class LBFHeuristic3(LBFHeuristicPolicy):
 
     def _get_target_pos(
         self,
-        agent_obs: Tuple[int, int, int],
-        food_obs: List[Tuple[int, int, int]],
-        other_agent_obs: List[Tuple[int, int, int]],
+        agent_obs: np.ndarray,
+        food_obs: np.ndarray,
+        food_coords: FrozenSet[Coord],
+        other_agent_obs: np.ndarray,
         last_action: LBFAction,
         target_pos: Optional[Coord],
     ) -> Optional[Coord]:
@@ -226,9 +363,10 @@ class LBFHeuristic4(LBFHeuristicPolicy):
 
     def _get_target_pos(
         self,
-        agent_obs: Tuple[int, int, int],
-        food_obs: List[Tuple[int, int, int]],
-        other_agent_obs: List[Tuple[int, int, int]],
+        agent_obs: np.ndarray,
+        food_obs: np.ndarray,
+        food_coords: FrozenSet[Coord],
+        other_agent_obs: np.ndarray,
         last_action: LBFAction,
         target_pos: Optional[Coord],
     ) -> Optional[Coord]:
@@ -237,17 +375,16 @@ class LBFHeuristic4(LBFHeuristicPolicy):
             # it. Each time it's current target food is collected it then selects a new
             # target based on the heuristic above.
             new_target_pos = self._get_updated_pos(target_pos, last_action)
-            if new_target_pos in (f[:2] for f in food_obs):
+            if new_target_pos in food_coords:
                 return new_target_pos
 
         # select new target
-        if not other_agent_obs:
+        if len(other_agent_obs) == 0:
             # act randomly until we see other agents
             return None
 
-        center_pos = self._center_of_agents(other_agent_obs)
-        return self._get_food_by_distance(
-            center_pos, food_obs, closest=False, max_food_level=agent_obs[2]
+        return self._get_food_by_center_distance(
+            other_agent_obs, food_obs, closest=False, max_food_level=agent_obs[2]
         )
 
 
@@ -258,9 +395,10 @@ class LBFHeuristic5(LBFHeuristicPolicy):
 
     def _get_target_pos(
         self,
-        agent_obs: Tuple[int, int, int],
-        food_obs: List[Tuple[int, int, int]],
-        other_agent_obs: List[Tuple[int, int, int]],
+        agent_obs: np.ndarray,
+        food_obs: np.ndarray,
+        food_coords: FrozenSet[Coord],
+        other_agent_obs: np.ndarray,
         last_action: LBFAction,
         target_pos: Optional[Coord],
     ) -> Optional[Coord]:
@@ -269,11 +407,14 @@ class LBFHeuristic5(LBFHeuristicPolicy):
             # it. Each time it's current target food is collected it then selects a new
             # target based on the heuristic above.
             new_target_pos = self._get_updated_pos(target_pos, last_action)
-            if new_target_pos in (f[:2] for f in food_obs):
+            if new_target_pos in food_coords:
                 return new_target_pos
 
-        level_sum = sum([o[2] for o in other_agent_obs]) + agent_obs[2]
-        food_coords = [f[:2] for f in food_obs if f[1] > -1 and f[2] <= level_sum]
-        if not food_coords:
+        level_sum = other_agent_obs[:, 2].sum() + agent_obs[2]
+        candidates = np.flatnonzero(
+            (food_obs[:, 1] > -1) & (food_obs[:, 2] <= level_sum)
+        )
+        if len(candidates) == 0:
             return None
-        return self._rng.choice(food_coords)
+        idx = candidates[self._randrange(len(candidates))]
+        return int(food_obs[idx, 0]), int(food_obs[idx, 1])
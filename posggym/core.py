@@ -10,10 +10,10 @@ https://github.com/Farama-Foundation/Gymnasium/blob/v0.27.0/gymnasium/core.py
 
 from __future__ import annotations
 
-import abc
 import copy
 from typing import TYPE_CHECKING, Any, Dict, Generic, List, Optional, Tuple, TypeVar
 
+from posggym import logger
 from posggym.model import ActType, ObsType, POSGModel, StateType
 
 if TYPE_CHECKING:
@@ -23,7 +23,7 @@ if TYPE_CHECKING:
     from posggym.envs.registration import EnvSpec
 
 
-class Env(abc.ABC, Generic[StateType, ObsType, ActType]):
+class Env(Generic[StateType, ObsType, ActType]):
     r"""The main POSGGym class for implementing POSG environments.
 
     The class encapsulates an environment and a POSG model. The environment maintains an
@@ -82,7 +82,6 @@ class Env(abc.ABC, Generic[StateType, ObsType, ActType]):
     # The model used by the environment
     model: POSGModel[StateType, ObsType, ActType]
 
-    @abc.abstractmethod
     def step(
         self, actions: Dict[str, ActType]
     ) -> Tuple[
@@ -131,6 +130,7 @@ class Env(abc.ABC, Generic[StateType, ObsType, ActType]):
             and logging) for each agent.
 
         """
+        raise NotImplementedError
 
     def reset(
         self, *, seed: int | None = None, options: Dict[str, Any] | None = None
@@ -219,7 +219,6 @@ class Env(abc.ABC, Generic[StateType, ObsType, ActType]):
         pass
 
     @property
-    @abc.abstractmethod
     def state(self) -> StateType:
         """The current state for this environment.
 
@@ -230,6 +229,7 @@ class Env(abc.ABC, Generic[StateType, ObsType, ActType]):
         StateType
 
         """
+        raise NotImplementedError
 
     @property
     def possible_agents(self) -> Tuple[str, ...]:
@@ -319,6 +319,39 @@ class Env(abc.ABC, Generic[StateType, ObsType, ActType]):
         """
         return self.model.is_symmetric
 
+    @property
+    def joint_action_space(self) -> spaces.Space:
+        """The space of joint actions of all possible agents.
+
+        If all agents have the same action space then this is a single batched space
+        with a leading agent dimension (e.g. ``MultiDiscrete`` for ``Discrete`` action
+        spaces, and a stacked ``Box`` for ``Box`` action spaces), so joint actions can
+        be sampled and checked with a single call. Otherwise it is a ``Tuple`` of each
+        agent's action space. In both cases agents are ordered as in
+        :attr:`possible_agents`.
+
+        Returns
+        -------
+        spaces.Space
+
+        """
+        return _get_joint_space(self, "_joint_action_space", self.action_spaces)
+
+    @property
+    def joint_observation_space(self) -> spaces.Space:
+        """The space of joint observations of all possible agents.
+
+        See :attr:`joint_action_space` for how the joint space is constructed.
+
+        Returns
+        -------
+        spaces.Space
+
+        """
+        return _get_joint_space(
+            self, "_joint_observation_space", self.observation_spaces
+        )
+
     @property
     def unwrapped(self) -> "Env":
         """Completely unwrap this env.
@@ -444,6 +477,18 @@ class Wrapper(Env[WrapperStateType, WrapperObsType, WrapperActType]):
     back to the wrapper's environment (i.e. to the corresponding attributes of
     :attr:`env`).
 
+    The wrapped environment's :attr:`model` is cached by the wrapper when it is
+    created, while its :attr:`action_spaces`, :attr:`observation_spaces`,
+    :attr:`reward_ranges`, :attr:`metadata` and :attr:`spec` are cached by the wrapper
+    on first access, since none of them are expected to change after the environment
+    is constructed. Setting one of these on a wrapper only updates the value cached by
+    that wrapper (and, for :attr:`model` and :attr:`spec`, the wrapped environment),
+    so it should be done on the outermost wrapper.
+
+    Attributes of the wrapped environment that are not part of the :class:`Env` API are
+    still forwarded by the wrapper, but this is deprecated. They should be accessed via
+    :attr:`unwrapped` (or :attr:`env`) instead, e.g. ``wrapper.unwrapped.some_attr``.
+
     Note
     ----
     If you inherit from :class:`Wrapper`, don't forget to call ``super().__init__(env)``
@@ -453,15 +498,21 @@ class Wrapper(Env[WrapperStateType, WrapperObsType, WrapperActType]):
 
     def __init__(self, env: Env[StateType, ObsType, ActType]):
         self.env = env
+        self._model: POSGModel = env.model
         self._action_spaces: Dict[str, spaces.Space] | None = None
         self._observation_spaces: Dict[str, spaces.Space] | None = None
         self._reward_ranges: Dict[str, Tuple[float, float]] | None = None
         self._metadata: Dict[str, Any] | None = None
+        self._spec: EnvSpec | None = None
 
     def __getattr__(self, name):
         """Returns attribute with ``name``, unless ``name`` starts with underscore."""
         if name.startswith("_"):
             raise AttributeError(f"attempted to get missing private attribute '{name}'")
+        logger.deprecation(
+            f"Accessing `{name}` of the wrapped environment through a wrapper is "
+            f"deprecated, use `env.unwrapped.{name}` instead."
+        )
         return getattr(self.env, name)
 
     @classmethod
@@ -472,11 +523,12 @@ class Wrapper(Env[WrapperStateType, WrapperObsType, WrapperActType]):
     @property
     def model(self) -> POSGModel:
         """Returns the :attr:`Env` :attr:`model`."""
-        return self.env.model
+        return self._model
 
     @model.setter
     def model(self, value: POSGModel):
         self.env.model = value
+        self._model = value
 
     @property
     def state(self) -> WrapperStateType:
@@ -501,7 +553,7 @@ class Wrapper(Env[WrapperStateType, WrapperObsType, WrapperActType]):
         wrapper :attr:`action_spaces` is used.
         """
         if self._action_spaces is None:
-            return self.env.action_spaces
+            self._action_spaces = self.env.action_spaces
         return self._action_spaces
 
     @action_spaces.setter
@@ -516,7 +568,7 @@ class Wrapper(Env[WrapperStateType, WrapperObsType, WrapperActType]):
         the wrapper :attr:`observation_spaces` is used.
         """
         if self._observation_spaces is None:
-            return self.env.observation_spaces
+            self._observation_spaces = self.env.observation_spaces
         return self._observation_spaces
 
     @observation_spaces.setter
@@ -531,7 +583,7 @@ class Wrapper(Env[WrapperStateType, WrapperObsType, WrapperActType]):
         the wrapper :attr:`reward_ranges` is used.
         """
         if self._reward_ranges is None:
-            return self.env.reward_ranges
+            self._reward_ranges = self.env.reward_ranges
         return self._reward_ranges
 
     @reward_ranges.setter
@@ -542,7 +594,7 @@ class Wrapper(Env[WrapperStateType, WrapperObsType, WrapperActType]):
     def metadata(self) -> Dict[str, Any]:
         """Returns the :attr:`Env` :attr:`metadata`."""
         if self._metadata is None:
-            return self.env.metadata
+            self._metadata = self.env.metadata
         return self._metadata
 
     @metadata.setter
@@ -552,11 +604,15 @@ class Wrapper(Env[WrapperStateType, WrapperObsType, WrapperActType]):
     @property
     def spec(self) -> EnvSpec | None:
         """Return the :attr:`Env` :attr:`spec` attribute."""
-        return self.env.spec
+        if self._spec is None:
+            # not cached until set, since `posggym.make` sets it after creation
+            self._spec = self.env.spec
+        return self._spec
 
     @spec.setter
     def spec(self, env_spec: EnvSpec):
         self.env.spec = env_spec
+        self._spec = env_spec
 
     @property
     def render_mode(self) -> str | None:
@@ -709,3 +765,27 @@ class ActionWrapper(Wrapper[StateType, ObsType, WrapperActType]):
     def actions(self, actions: Dict[str, ActType]) -> Dict[str, WrapperActType]:
         """Transform actions for wrapped environment."""
         raise NotImplementedError
+
+
+def _get_joint_space(
+    env: Env, attr_name: str, agent_spaces: Dict[str, spaces.Space]
+) -> spaces.Space:
+    """Get joint space of all agents, reusing the one cached on env when possible.
+
+    The joint space is rebuilt only if any of the agent spaces have been replaced
+    since it was cached (e.g. by a wrapper setting :attr:`Env.action_spaces`).
+    """
+    from gymnasium import spaces
+    from gymnasium.vector.utils.spaces import batch_space
+
+    space_list = [agent_spaces[i] for i in env.possible_agents]
+    cached = env.__dict__.get(attr_name)
+    if cached is not None and all(a is b for a, b in zip(cached[0], space_list)):
+        return cached[1]
+
+    if all(space == space_list[0] for space in space_list[1:]):
+        joint_space = batch_space(space_list[0], n=len(space_list))
+    else:
+        joint_space = spaces.Tuple(space_list)
+    env.__dict__[attr_name] = (space_list, joint_space)
+    return joint_space
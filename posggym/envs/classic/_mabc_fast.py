@@ -0,0 +1,149 @@
+"""Compiled kernels for the Multi-Access Broadcast Channel model.
+
+The kernels are compiled with `numba <https://numba.pydata.org/>`_ when it is
+installed, in which case the channels in a batch are stepped in parallel.
+``NUMBA_AVAILABLE`` is ``False`` otherwise, in which case the same kernels run as
+plain Python.
+"""
+from typing import Tuple
+
+import numpy as np
+
+from posggym.envs.classic.mabc import COLLISION, EMPTY, FULL, NOCOLLISION, SEND
+
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Leave functions uncompiled when numba isn't installed."""
+        return lambda fn: fn
+
+
+def _step(
+    states: np.ndarray,
+    actions: np.ndarray,
+    fill_probs: np.ndarray,
+    obs_prob: float,
+    r_send: float,
+    r_no_send: float,
+    rand: np.ndarray,
+    out_states: np.ndarray,
+    out_obs: np.ndarray,
+    out_rewards: np.ndarray,
+):
+    """Step a batch of ``B`` channels, writing results into the ``out_*`` arrays.
+
+    Arguments
+    ---------
+    states : np.ndarray
+        ``(B, N)`` uint8 array of node buffer states.
+    actions : np.ndarray
+        ``(B, N)`` array of node actions.
+    fill_probs, obs_prob, r_send, r_no_send
+        Same as for :func:`rollout`.
+    rand : np.ndarray
+        ``(2, B, N)`` uniform random numbers in ``[0, 1)``, used for sampling
+        buffer fills (``rand[0]``) and observations (``rand[1]``).
+    out_states, out_obs : np.ndarray
+        ``(B, N)`` uint8 arrays for the next node buffer states and observations.
+        ``out_states`` may be ``states``.
+    out_rewards : np.ndarray
+        ``(B,)`` array for the reward (shared by all nodes) of each channel.
+
+    """
+    B, N = actions.shape
+    for b in prange(B):
+        num_senders = 0
+        sender_full = False
+        for i in range(N):
+            if actions[b, i] == SEND:
+                num_senders += 1
+                sender_full = sender_full or states[b, i] == FULL
+        out_rewards[b] = r_send if num_senders == 1 and sender_full else r_no_send
+        correct_obs = COLLISION if num_senders > 1 else NOCOLLISION
+
+        for i in range(N):
+            # buffer emptied even if there is a collision
+            s_i = EMPTY if actions[b, i] == SEND else states[b, i]
+            out_states[b, i] = FULL if rand[0, b, i] <= fill_probs[i] else s_i
+            if rand[1, b, i] <= obs_prob:
+                out_obs[b, i] = correct_obs
+            else:
+                out_obs[b, i] = 1 - correct_obs
+
+
+def _rollout(
+    states: np.ndarray,
+    actions: np.ndarray,
+    fill_probs: np.ndarray,
+    obs_prob: float,
+    r_send: float,
+    r_no_send: float,
+    rand: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Run ``T`` steps for each of a batch of ``B`` channels.
+
+    Arguments
+    ---------
+    states : np.ndarray
+        ``(B, N)`` uint8 array of initial node buffer states.
+    actions : np.ndarray
+        ``(B, T, N)`` array of node actions for each step.
+    fill_probs : np.ndarray
+        ``(N,)`` probability each node's buffer is filled each step.
+    obs_prob : float
+        Probability each node observes the true collision outcome.
+    r_send, r_no_send : float
+        Reward when a message is, or is not, successfully broadcast.
+    rand : np.ndarray
+        ``(B, T, 2, N)`` uniform random numbers in ``[0, 1)``, used for sampling
+        buffer fills (``rand[:, :, 0]``) and observations (``rand[:, :, 1]``).
+
+    Returns
+    -------
+    next_states : np.ndarray
+        ``(B, T, N)`` uint8 array of the node buffer states after each step.
+    obs : np.ndarray
+        ``(B, T, N)`` uint8 array of node observations after each step.
+    rewards : np.ndarray
+        ``(B, T)`` array of the reward (shared by all nodes) for each step.
+
+    """
+    B, T, N = actions.shape
+    next_states = np.empty((B, T, N), np.uint8)
+    obs = np.empty((B, T, N), np.uint8)
+    rewards = np.empty((B, T), np.float64)
+    for b in prange(B):
+        s = states[b].copy()
+        for t in range(T):
+            num_senders = 0
+            sender_full = False
+            for i in range(N):
+                if actions[b, t, i] == SEND:
+                    num_senders += 1
+                    sender_full = sender_full or s[i] == FULL
+            rewards[b, t] = r_send if num_senders == 1 and sender_full else r_no_send
+            correct_obs = COLLISION if num_senders > 1 else NOCOLLISION
+
+            for i in range(N):
+                # buffer emptied even if there is a collision
+                if actions[b, t, i] == SEND:
+                    s[i] = EMPTY
+                if rand[b, t, 0, i] <= fill_probs[i]:
+                    s[i] = FULL
+                if rand[b, t, 1, i] <= obs_prob:
+                    obs[b, t, i] = correct_obs
+                else:
+                    obs[b, t, i] = 1 - correct_obs
+            next_states[b, t] = s
+    return next_states, obs, rewards
+
+
+step = njit(parallel=True, cache=True)(_step)
+rollout = njit(parallel=True, cache=True)(_rollout)
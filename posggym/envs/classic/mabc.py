@@ -3,6 +3,7 @@ import sys
 from itertools import product
 from typing import Dict, List, Optional, Tuple, Union
 
+import numpy as np
 from gymnasium import spaces
 
 import posggym.model as M
@@ -14,19 +15,19 @@ MABCState = Tuple[int, ...]
 EMPTY = 0
 FULL = 1
 NODE_STATES = [EMPTY, FULL]
-NODE_STATE_STR = ["E", "F"]
+NODE_STATE_STR = ("E", "F")
 
 MABCAction = int
 SEND = 0
 NOSEND = 1
 ACTIONS = [SEND, NOSEND]
-ACTION_STR = ["S", "NS"]
+ACTION_STR = ("S", "NS")
 
 MABCObs = int
 COLLISION = 0
 NOCOLLISION = 1
 OBS = [COLLISION, NOCOLLISION]
-OBS_STR = ["C", "NC"]
+OBS_STR = ("C", "NC")
 
 
 class MABCEnv(DefaultEnv[MABCState, MABCObs, MABCAction]):
@@ -144,21 +145,21 @@ class MABCEnv(DefaultEnv[MABCState, MABCObs, MABCAction]):
 
         assert self._last_obs is not None
 
-        state_str = ", ".join([NODE_STATE_STR[s] for s in self._state])
+        model: MABCModel = self.model  # type: ignore
+        state_str = model._state_strs[self._state]
         obs_str = ", ".join([OBS_STR[o] for o in self._last_obs.values()])
-        output = [
-            f"Step: {self._step_num}",
-            f"State: <{state_str}>",
-            f"Obs: <{obs_str}>",
-        ]
+        action_str = ""
         if self._last_actions is not None:
             action_str = ", ".join([ACTION_STR[a] for a in self._last_actions.values()])
-            output.insert(1, f"Actions: <{action_str}>")
-
+            action_str = f"Actions: <{action_str}>\n"
+        reward_str = ""
         if self._last_rewards is not None:
-            output.append(f"Rewards: <{tuple(self._last_rewards.values())}>")
+            reward_str = f"Rewards: <{tuple(self._last_rewards.values())}>\n"
 
-        output_str = "\n".join(output) + "\n"
+        output_str = (
+            f"Step: {self._step_num}\n{action_str}State: <{state_str}>\n"
+            f"Obs: <{obs_str}>\n{reward_str}"
+        )
 
         if self.render_mode == "human":
             sys.stdout.write(output_str)
@@ -177,6 +178,13 @@ class MABCModel(M.POSGFullModel[MABCState, MABCObs, MABCAction]):
     R_SEND = 1.0
     R_NO_SEND = 0.0
 
+    # max number of nodes for which the tables used by `step_batch_table` are built
+    MAX_TABLE_NODES = 4
+
+    # counter-based RNG used by the batched methods, created as needed by `np_rng`
+    # property. The scalar methods use `rng`, which is faster for single draws
+    _np_rng: Optional[np.random.Generator] = None
+
     def __init__(
         self,
         num_nodes: int = 2,
@@ -200,6 +208,13 @@ class MABCModel(M.POSGFullModel[MABCState, MABCObs, MABCAction]):
         self._fill_probs = fill_probs
         self._obs_prob = observation_prob
         self._init_buffer_dist = init_buffer_dist
+        # per node probabilities, used by the batched methods
+        self._fill_probs_arr = np.asarray(fill_probs, dtype=np.float64)
+        self._init_buffer_arr = np.asarray(init_buffer_dist, dtype=np.float64)
+        # value of each node's bit, used by the bit-packed batched methods
+        self._node_bits = np.left_shift(
+            np.uint64(1), np.arange(min(num_nodes, 64), dtype=np.uint64)
+        )
 
         self.possible_agents = tuple(str(i) for i in range(num_nodes))
         self.state_space = spaces.Tuple(
@@ -219,11 +234,22 @@ class MABCModel(M.POSGFullModel[MABCState, MABCObs, MABCAction]):
         )
         self._action_spaces = tuple([*ACTIONS] for _ in self.possible_agents)
         self._observation_spaces = tuple([*OBS] for _ in self.possible_agents)
+        # render string for each state
+        self._state_strs = {
+            s: ", ".join([NODE_STATE_STR[s_i] for s_i in s]) for s in self._state_space
+        }
 
         self._trans_map = self._construct_trans_func()
         self._rew_map = self._construct_rew_func()
         self._obs_map = self._construct_obs_func()
 
+        # tables indexed by bit-packed states, actions and obs (see `step_batch_table`)
+        self._next_state_cdf: Optional[np.ndarray] = None
+        self._obs_cdf: Optional[np.ndarray] = None
+        self._reward_table: Optional[np.ndarray] = None
+        if num_nodes <= self.MAX_TABLE_NODES:
+            self._construct_batch_tables()
+
     @property
     def reward_ranges(self) -> Dict[str, Tuple[float, float]]:
         return {i: (self.R_NO_SEND, self.R_SEND) for i in self.possible_agents}
@@ -234,6 +260,17 @@ class MABCModel(M.POSGFullModel[MABCState, MABCObs, MABCAction]):
             self._rng, seed = seeding.std_random()
         return self._rng
 
+    @property
+    def np_rng(self) -> np.random.Generator:
+        """NumPy RNG used by the batched methods."""
+        if self._np_rng is None:
+            self._np_rng, _ = seeding.np_random(bit_generator=np.random.Philox)
+        return self._np_rng
+
+    def seed(self, seed: Optional[int] = None):
+        super().seed(seed)
+        self._np_rng, _ = seeding.np_random(seed, np.random.Philox)
+
     def get_agents(self, state: MABCState) -> List[str]:
         return list(self.possible_agents)
 
@@ -266,6 +303,285 @@ class MABCModel(M.POSGFullModel[MABCState, MABCObs, MABCAction]):
             next_state, obs, rewards, terminated, truncated, all_done, info
         )
 
+    def sample_initial_state_batch(self, num_envs: int) -> np.ndarray:
+        """Sample initial states for a batch of independent channels.
+
+        Arguments
+        ---------
+        num_envs : int
+            The number of channels in the batch.
+
+        Returns
+        -------
+        states : np.ndarray
+            ``(num_envs, num_nodes)`` uint8 array of node buffer states.
+
+        """
+        rand = self.np_rng.random((num_envs, len(self.possible_agents)))
+        return (rand <= self._init_buffer_arr).astype(np.uint8)
+
+    def step_batch(
+        self,
+        states: np.ndarray,
+        actions: np.ndarray,
+        out: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Step a batch of independent channels.
+
+        Uses the same dynamics as :meth:`step`, but all channels are advanced
+        together. When `numba` is installed the whole step runs as a single compiled
+        pass over the batch, otherwise it uses vectorized NumPy operations.
+
+        Arguments
+        ---------
+        states : np.ndarray
+            ``(num_envs, num_nodes)`` uint8 array of node buffer states.
+        actions : np.ndarray
+            ``(num_envs, num_nodes)`` array of node actions.
+        out : Tuple[np.ndarray, np.ndarray, np.ndarray], optional
+            Preallocated ``(next_states, obs, rewards)`` arrays, with the shapes and
+            dtypes of the returned arrays, to write the results into. Allows the same
+            arrays to be reused across steps, ``next_states`` may be ``states``.
+
+        Returns
+        -------
+        next_states : np.ndarray
+            ``(num_envs, num_nodes)`` uint8 array of next node buffer states.
+        obs : np.ndarray
+            ``(num_envs, num_nodes)`` uint8 array of node observations.
+        rewards : np.ndarray
+            ``(num_envs,)`` array of the reward (shared by all nodes) for each
+            channel.
+
+        """
+        # imported here since kernels module depends on this module's constants
+        from posggym.envs.classic import _mabc_fast
+
+        rand = self.np_rng.random((2, *states.shape))
+        if _mabc_fast.NUMBA_AVAILABLE:
+            if out is None:
+                out = (
+                    np.empty(states.shape, np.uint8),
+                    np.empty(states.shape, np.uint8),
+                    np.empty(len(states), np.float64),
+                )
+            _mabc_fast.step(
+                states,
+                actions,
+                self._fill_probs_arr,
+                float(self._obs_prob),
+                self.R_SEND,
+                self.R_NO_SEND,
+                rand,
+                *out,
+            )
+            return out
+
+        send = actions == SEND
+        num_senders = send.sum(axis=1)
+        collision = num_senders > 1
+        message_sent = (num_senders == 1) & (send & (states == FULL)).any(axis=1)
+
+        # buffer emptied even if there is a collision
+        fill = rand[0] <= self._fill_probs_arr
+        next_states = ((states == FULL) & ~send) | fill
+
+        # NOCOLLISION=1, so flip the no-collision flag for incorrect observations
+        obs = (rand[1] > self._obs_prob) ^ ~collision[:, None]
+
+        rewards = np.where(message_sent, self.R_SEND, self.R_NO_SEND)
+        if out is None:
+            return next_states.astype(np.uint8), obs.astype(np.uint8), rewards
+        out[0][:] = next_states
+        out[1][:] = obs
+        out[2][:] = rewards
+        return out
+
+    def rollout_batch(
+        self, states: np.ndarray, actions: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Run a sequence of steps for a batch of independent channels.
+
+        Uses the same dynamics as :meth:`step_batch`, but all steps are run in one
+        compiled loop (when `numba` is installed), in parallel over channels.
+
+        Arguments
+        ---------
+        states : np.ndarray
+            ``(num_envs, num_nodes)`` uint8 array of initial node buffer states.
+        actions : np.ndarray
+            ``(num_envs, num_steps, num_nodes)`` array of node actions for each step.
+
+        Returns
+        -------
+        next_states : np.ndarray
+            ``(num_envs, num_steps, num_nodes)`` uint8 array of the node buffer
+            states after each step.
+        obs : np.ndarray
+            ``(num_envs, num_steps, num_nodes)`` uint8 array of node observations
+            after each step.
+        rewards : np.ndarray
+            ``(num_envs, num_steps)`` array of the reward (shared by all nodes) for
+            each step.
+
+        """
+        # imported here since kernels module depends on this module's constants
+        from posggym.envs.classic import _mabc_fast
+
+        num_envs, num_steps, num_nodes = actions.shape
+        rand = self.np_rng.random((num_envs, num_steps, 2, num_nodes))
+        return _mabc_fast.rollout(
+            np.ascontiguousarray(states, dtype=np.uint8),
+            np.ascontiguousarray(actions, dtype=np.uint8),
+            self._fill_probs_arr,
+            float(self._obs_prob),
+            self.R_SEND,
+            self.R_NO_SEND,
+            rand,
+        )
+
+    def pack_batch(self, values: np.ndarray) -> np.ndarray:
+        """Pack a ``(num_envs, num_nodes)`` array into ``(num_envs,)`` uint64 masks.
+
+        Bit ``i`` of each mask is set if ``values[:, i]`` is non-zero. Only supported
+        for up to 64 nodes.
+        """
+        assert values.shape[-1] == len(self._node_bits) <= 64
+        return ((values != 0) * self._node_bits).sum(axis=-1, dtype=np.uint64)
+
+    def unpack_batch(self, packed: np.ndarray) -> np.ndarray:
+        """Unpack ``(num_envs,)`` uint64 masks into ``(num_envs, num_nodes)`` arrays."""
+        return ((packed[:, None] & self._node_bits) != 0).astype(np.uint8)
+
+    def step_batch_packed(
+        self, states: np.ndarray, send: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Step a batch of independent channels using bit-packed states.
+
+        Same as :meth:`step_batch` except states, actions and observations are
+        ``(num_envs,)`` uint64 bitmasks with one bit per node (see
+        :meth:`pack_batch`). Only supported for up to 64 nodes.
+
+        Arguments
+        ---------
+        states : np.ndarray
+            ``(num_envs,)`` uint64 masks with bit ``i`` set if node ``i``'s buffer is
+            ``FULL``.
+        send : np.ndarray
+            ``(num_envs,)`` uint64 masks with bit ``i`` set if node ``i`` performs
+            the ``SEND`` action.
+
+        Returns
+        -------
+        next_states : np.ndarray
+            ``(num_envs,)`` uint64 masks of next node buffer states.
+        obs : np.ndarray
+            ``(num_envs,)`` uint64 masks with bit ``i`` set if node ``i`` observes
+            ``NOCOLLISION``.
+        rewards : np.ndarray
+            ``(num_envs,)`` array of the reward (shared by all nodes) for each
+            channel.
+
+        """
+        num_nodes = len(self.possible_agents)
+        assert num_nodes <= 64
+        all_nodes = self._node_bits.sum(dtype=np.uint64)
+
+        # more than one bit set in send mask
+        collision = (send & (send - np.uint64(1))) != 0
+        message_sent = ~collision & ((send & states) != 0)
+
+        rand = self.np_rng.random((2, len(states), num_nodes))
+        # buffer emptied even if there is a collision
+        fill = self.pack_batch(rand[0] <= self._fill_probs_arr)
+        next_states = (states & ~send) | fill
+
+        correct_obs = np.where(collision, np.uint64(0), all_nodes)
+        obs = correct_obs ^ self.pack_batch(rand[1] > self._obs_prob)
+
+        rewards = np.where(message_sent, self.R_SEND, self.R_NO_SEND)
+        return next_states, obs, rewards
+
+    def step_batch_table(
+        self, states: np.ndarray, send: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Step a batch of independent channels using precomputed tables.
+
+        Same inputs and outputs as :meth:`step_batch_packed`, except the next state
+        and observation of each channel are each sampled from a precomputed
+        distribution over all ``2**num_nodes`` masks using a single random number.
+        Only supported for up to ``MAX_TABLE_NODES`` nodes.
+
+        Arguments
+        ---------
+        states : np.ndarray
+            ``(num_envs,)`` uint64 masks with bit ``i`` set if node ``i``'s buffer is
+            ``FULL``.
+        send : np.ndarray
+            ``(num_envs,)`` uint64 masks with bit ``i`` set if node ``i`` performs
+            the ``SEND`` action.
+
+        Returns
+        -------
+        next_states : np.ndarray
+            ``(num_envs,)`` uint64 masks of next node buffer states.
+        obs : np.ndarray
+            ``(num_envs,)`` uint64 masks with bit ``i`` set if node ``i`` observes
+            ``NOCOLLISION``.
+        rewards : np.ndarray
+            ``(num_envs,)`` array of the reward (shared by all nodes) for each
+            channel.
+
+        """
+        assert self._next_state_cdf is not None and self._obs_cdf is not None
+        assert self._reward_table is not None
+        states = states.astype(np.intp)
+        send = send.astype(np.intp)
+        collision = ((send & (send - 1)) != 0).astype(np.intp)
+
+        rand = self.np_rng.random((2, len(states), 1))
+        # index of first mask whose cumulative probability exceeds the sample
+        next_states = (self._next_state_cdf[states, send] <= rand[0]).sum(axis=1)
+        obs = (self._obs_cdf[collision] <= rand[1]).sum(axis=1)
+
+        rewards = self._reward_table[states, send]
+        return next_states.astype(np.uint64), obs.astype(np.uint64), rewards
+
+    def _construct_batch_tables(self):
+        num_nodes = len(self.possible_agents)
+        masks = np.arange(2**num_nodes)
+        # (2**num_nodes, num_nodes) bool value of each node's bit for each mask
+        bits = ((masks[:, None] >> np.arange(num_nodes)) & 1).astype(bool)
+
+        # (state, send, node) prob node's buffer is FULL after the step
+        keep_full = bits[:, None, :] & ~bits[None, :, :]
+        full_prob = np.where(keep_full, 1.0, self._fill_probs_arr)
+        # (state, send, next_state) prob of next state
+        trans_probs = np.where(
+            bits[None, None, :, :],
+            full_prob[:, :, None, :],
+            1.0 - full_prob[:, :, None, :],
+        ).prod(axis=-1)
+        self._next_state_cdf = np.cumsum(trans_probs, axis=-1)
+        self._next_state_cdf[..., -1] = 1.0
+
+        # (collision, obs) prob of obs, where NOCOLLISION bits are set
+        correct_obs = np.array([np.ones(num_nodes, bool), np.zeros(num_nodes, bool)])
+        obs_probs = np.where(
+            bits[None, :, :] == correct_obs[:, None, :],
+            self._obs_prob,
+            1.0 - self._obs_prob,
+        ).prod(axis=-1)
+        self._obs_cdf = np.cumsum(obs_probs, axis=-1)
+        self._obs_cdf[..., -1] = 1.0
+
+        # (state, send) shared reward
+        num_senders = bits.sum(axis=1)
+        message_sent = (num_senders[None, :] == 1) & (
+            (masks[:, None] & masks[None, :]) != 0
+        )
+        self._reward_table = np.where(message_sent, self.R_SEND, self.R_NO_SEND)
+
     def _sample_next_state(
         self, state: MABCState, actions: Dict[str, MABCAction]
     ) -> MABCState:
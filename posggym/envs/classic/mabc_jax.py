@@ -0,0 +1,106 @@
+"""JAX implementation of the Multi-Access Broadcast Channel dynamics.
+
+The dynamics are written as pure functions of ``(state, action, key)`` so that
+complete rollouts, over batches of seeds, are compiled into a single XLA graph. They
+match :meth:`posggym.envs.classic.mabc.MABCModel.step_batch`.
+
+The model parameters are passed in explicitly, and can be taken from an existing
+model::
+
+    model = MABCModel()
+    params = model_params(model)
+    keys = jax.random.split(jax.random.PRNGKey(0), num_seeds)
+    states, obs, rewards = batch_rollout(keys, actions, *params)
+
+"""
+from typing import Tuple
+
+from posggym.envs.classic.mabc import COLLISION, FULL, NOCOLLISION, SEND, MABCModel
+from posggym.error import DependencyNotInstalled
+
+
+try:
+    import jax
+    import jax.numpy as jnp
+except ImportError as e:
+    raise DependencyNotInstalled(
+        "jax is not installed, run `pip install posggym[jax]`"
+    ) from e
+
+
+def model_params(model: MABCModel) -> Tuple[jnp.ndarray, jnp.ndarray, float]:
+    """Get the ``(fill_probs, init_buffer_dist, obs_prob)`` parameters of a model."""
+    return (
+        jnp.asarray(model._fill_probs_arr, dtype=jnp.float32),
+        jnp.asarray(model._init_buffer_arr, dtype=jnp.float32),
+        float(model._obs_prob),
+    )
+
+
+def _initial_state(key: jnp.ndarray, init_buffer_dist: jnp.ndarray) -> jnp.ndarray:
+    rand = jax.random.uniform(key, init_buffer_dist.shape)
+    return (rand <= init_buffer_dist).astype(jnp.uint8)
+
+
+def _step(
+    state: jnp.ndarray,
+    action: jnp.ndarray,
+    key: jnp.ndarray,
+    fill_probs: jnp.ndarray,
+    obs_prob: float,
+) -> Tuple[jnp.ndarray, jnp.ndarray, jnp.ndarray]:
+    fill_key, obs_key = jax.random.split(key)
+    send = action == SEND
+    num_senders = jnp.sum(send, axis=-1)
+    collision = num_senders > 1
+    message_sent = (num_senders == 1) & jnp.any(send & (state == FULL), axis=-1)
+
+    # buffer emptied even if there is a collision
+    fill = jax.random.uniform(fill_key, state.shape) <= fill_probs
+    next_state = (((state == FULL) & ~send) | fill).astype(jnp.uint8)
+
+    correct_obs = jnp.where(collision, COLLISION, NOCOLLISION)[..., None]
+    obs_correct = jax.random.uniform(obs_key, state.shape) <= obs_prob
+    obs = jnp.where(obs_correct, correct_obs, 1 - correct_obs).astype(jnp.uint8)
+
+    reward = jnp.where(message_sent, MABCModel.R_SEND, MABCModel.R_NO_SEND)
+    return next_state, obs, reward
+
+
+def _rollout(
+    key: jnp.ndarray,
+    actions: jnp.ndarray,
+    fill_probs: jnp.ndarray,
+    init_buffer_dist: jnp.ndarray,
+    obs_prob: float,
+) -> Tuple[jnp.ndarray, jnp.ndarray, jnp.ndarray]:
+    init_key, key = jax.random.split(key)
+    state = _initial_state(init_key, init_buffer_dist)
+    step_keys = jax.random.split(key, actions.shape[0])
+
+    def scan_step(state, xs):
+        action, step_key = xs
+        next_state, obs, reward = _step(state, action, step_key, fill_probs, obs_prob)
+        return next_state, (next_state, obs, reward)
+
+    _, (states, obs, rewards) = jax.lax.scan(scan_step, state, (actions, step_keys))
+    return states, obs, rewards
+
+
+initial_state = jax.jit(_initial_state)
+"""Sample an initial ``(num_nodes,)`` state."""
+
+step = jax.jit(_step)
+"""Step the channel, returning ``(next_state, obs, reward)``.
+
+``state`` and ``action`` may have any number of leading batch dimensions.
+"""
+
+rollout = jax.jit(_rollout)
+"""Run an episode of ``(T, num_nodes)`` actions from a sampled initial state.
+
+Returns ``(states, obs, rewards)`` stacked over the ``T`` steps.
+"""
+
+batch_rollout = jax.jit(jax.vmap(_rollout, in_axes=(0, 0, None, None, None)))
+"""Run :func:`rollout` for a batch of keys and ``(B, T, num_nodes)`` actions."""
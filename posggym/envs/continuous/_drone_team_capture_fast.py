@@ -0,0 +1,236 @@
+"""Compiled kernels for the Drone Team Capture model.
+
+The kernels are compiled with `numba <https://numba.pydata.org/>`_ when it is
+installed. ``NUMBA_AVAILABLE`` is ``False`` otherwise, in which case the model falls
+back to an equivalent NumPy implementation.
+"""
+import math
+from typing import Tuple
+
+import numpy as np
+
+
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Leave functions uncompiled when numba isn't installed."""
+        return lambda fn: fn
+
+
+def _wrap_angle(angle: float) -> float:
+    """Convert angle in radians to be in (-pi, pi] interval."""
+    angle = angle % (2 * math.pi)
+    if angle > math.pi:
+        angle -= 2 * math.pi
+    return angle
+
+
+def _relative_position(
+    agent: np.ndarray, target: np.ndarray, cos_yaw: float, sin_yaw: float
+) -> Tuple[float, float, float]:
+    """Get ``(x, y)`` of target in the frame of agent, and the distance between them.
+
+    ``cos_yaw`` and ``sin_yaw`` are the cosine and sine of the agent's yaw.
+    """
+    # difference taken at the precision of the states, as in the NumPy version
+    dx = np.float64(target[0] - agent[0])
+    dy = np.float64(target[1] - agent[1])
+    rel_x = cos_yaw * dx + sin_yaw * dy
+    rel_y = -sin_yaw * dx + cos_yaw * dy
+    return rel_x, rel_y, math.sqrt(dx * dx + dy * dy)
+
+
+def _engage(
+    agent: np.ndarray,
+    target: np.ndarray,
+    dist_norm_factor: float,
+    observation_limit: float,
+) -> Tuple[float, float, bool, float]:
+    """Get the normalized ``(alpha, dist, visible)`` engagement of target by agent.
+
+    Also returns the (unnormalized) distance between them. ``observation_limit`` is
+    negative if there is no limit.
+    """
+    yaw = np.float64(agent[2])
+    rel_x, rel_y, dist = _relative_position(agent, target, math.cos(yaw), math.sin(yaw))
+    if 0 <= observation_limit < dist:
+        return -1.0, -1.0, False, dist
+    alpha = _wrap_angle(math.atan2(rel_y, rel_x))
+    return alpha / math.pi, dist / dist_norm_factor, True, dist
+
+
+def _target_rates(
+    alpha_t: float,
+    dist_t: float,
+    alpha_t_prev: float,
+    dist_t_prev: float,
+    max_rate: float,
+) -> Tuple[float, float]:
+    """Get the normalized change in target ``(alpha, dist)`` engagement."""
+    # wrap change in normalized angle from [-2, 2] into (-1, 1]
+    alpha_rate = alpha_t - alpha_t_prev
+    if alpha_rate > 1.0:
+        alpha_rate -= 2.0
+    elif alpha_rate <= -1.0:
+        alpha_rate += 2.0
+    dist_rate = (dist_t - dist_t_prev + max_rate) / (max_rate + max_rate)
+    return alpha_rate, dist_rate * 2.0 - 1.0
+
+
+def _insert_closest(
+    kept: np.ndarray,
+    num_kept: int,
+    max_kept: int,
+    rel_x: float,
+    rel_y: float,
+    dist: float,
+    key: float,
+) -> int:
+    """Insert a pursuer into the ``max_kept`` closest, sorted by ``key``.
+
+    ``kept`` is a ``(4, N)`` array whose columns are the ``(rel_x, rel_y, dist, key)``
+    of the ``num_kept`` pursuers kept so far. Returns the new number kept.
+    """
+    if num_kept == max_kept:
+        if kept[3, num_kept - 1] <= key:
+            return num_kept
+        # drop the furthest kept pursuer
+        num_kept -= 1
+    k = num_kept
+    while k > 0 and kept[3, k - 1] > key:
+        kept[0, k] = kept[0, k - 1]
+        kept[1, k] = kept[1, k - 1]
+        kept[2, k] = kept[2, k - 1]
+        kept[3, k] = kept[3, k - 1]
+        k -= 1
+    kept[0, k] = rel_x
+    kept[1, k] = rel_y
+    kept[2, k] = dist
+    kept[3, k] = key
+    return num_kept + 1
+
+
+def _build_obs(
+    pursuers: np.ndarray,
+    prev_pursuers: np.ndarray,
+    target: np.ndarray,
+    prev_target: np.ndarray,
+    n_com_pursuers: int,
+    r_arena: float,
+    observation_limit: float,
+    max_rate: float,
+    prev_target_engagement: np.ndarray,
+    target_engagement: np.ndarray,
+    scratch: np.ndarray,
+    out: np.ndarray,
+):
+    """Write the observation of each pursuer into the rows of ``out``.
+
+    Arguments
+    ---------
+    pursuers, prev_pursuers : np.ndarray
+        ``(N, 6)`` float32 arrays of the current and previous pursuer states.
+    target, prev_target : np.ndarray
+        ``(6,)`` float32 arrays of the current and previous target state.
+    n_com_pursuers : int
+        Number of closest other pursuers included in each observation.
+    r_arena : float
+        Radius of the arena.
+    observation_limit : float
+        Max observation distance, or ``-1`` if there is no limit.
+    max_rate : float
+        Max normalized change in distance between two entities in one step.
+    prev_target_engagement : np.ndarray
+        ``(4, N)`` float64 array of the engagement of the previous target by each
+        previous pursuer, as written into ``target_engagement`` by the previous call.
+        Computed from the previous states if it is empty.
+    target_engagement : np.ndarray
+        ``(4, N)`` float64 array for the engagement of the target by each pursuer,
+        followed by the distance between them.
+    scratch : np.ndarray
+        ``(4, N)`` float64 array used as working space for the closest pursuers.
+    out : np.ndarray
+        ``(N, 8 + 2 * n_com_pursuers)`` float32 array for the observations.
+
+    """
+    n = pursuers.shape[0]
+    dist_norm_factor = 2 * r_arena
+    # constants for normalizing positions at float32 precision, as in NumPy version
+    pos_scale = np.float32(dist_norm_factor)
+    two = np.float32(2.0)
+    one = np.float32(1.0)
+
+    for i in range(n):
+        # target engagement, and its change since previous step
+        alpha_t, dist_t, visible, target_dist = _engage(
+            pursuers[i], target, dist_norm_factor, observation_limit
+        )
+        target_engagement[0, i] = alpha_t
+        target_engagement[1, i] = dist_t
+        target_engagement[2, i] = visible
+        target_engagement[3, i] = target_dist
+        if prev_target_engagement.shape[1]:
+            alpha_t_prev = prev_target_engagement[0, i]
+            dist_t_prev = prev_target_engagement[1, i]
+            prev_visible = prev_target_engagement[2, i] != 0
+        else:
+            alpha_t_prev, dist_t_prev, prev_visible, _ = _engage(
+                prev_pursuers[i], prev_target, dist_norm_factor, observation_limit
+            )
+        alpha_rate, dist_rate = -1.0, -1.0
+        if visible and prev_visible:
+            alpha_rate, dist_rate = _target_rates(
+                alpha_t, dist_t, alpha_t_prev, dist_t_prev, max_rate
+            )
+
+        # engagement with each other pursuer, keeping only the n_com_pursuers closest
+        # insertion sorted by distance with any invalid (-1) put at the end. Only the
+        # relative position of each is kept, with the angle computed for those kept
+        yaw = np.float64(pursuers[i, 2])
+        cos_yaw, sin_yaw = math.cos(yaw), math.sin(yaw)
+        num_kept = 0
+        for j in range(n):
+            rel_x, rel_y, dist_j = 0.0, 0.0, -1.0
+            key = np.inf
+            if j != i:
+                rel_x, rel_y, raw_dist = _relative_position(
+                    pursuers[i], pursuers[j], cos_yaw, sin_yaw
+                )
+                if not 0 <= observation_limit < raw_dist:
+                    dist_j = raw_dist / dist_norm_factor
+                    key = dist_j
+            num_kept = _insert_closest(
+                scratch, num_kept, n_com_pursuers, rel_x, rel_y, dist_j, key
+            )
+
+        angle = _wrap_angle(np.float64(pursuers[i, 2])) / math.pi
+        prev_angle = _wrap_angle(np.float64(prev_pursuers[i, 2])) / math.pi
+
+        out[i, 0] = angle
+        out[i, 1] = (angle - prev_angle) / 2
+        out[i, 2] = pursuers[i, 0] / pos_scale * two - one
+        out[i, 3] = pursuers[i, 1] / pos_scale * two - one
+        out[i, 4] = alpha_t
+        out[i, 5] = dist_t
+        out[i, 6] = alpha_rate
+        out[i, 7] = dist_rate
+        for k in range(n_com_pursuers):
+            if scratch[3, k] == np.inf:
+                out[i, 8 + 2 * k] = -1.0
+            else:
+                alpha_k = _wrap_angle(math.atan2(scratch[1, k], scratch[0, k]))
+                out[i, 8 + 2 * k] = alpha_k / math.pi
+            out[i, 9 + 2 * k] = scratch[2, k]
+
+
+_wrap_angle = njit(cache=True)(_wrap_angle)
+_relative_position = njit(cache=True)(_relative_position)
+_target_rates = njit(cache=True)(_target_rates)
+_insert_closest = njit(cache=True)(_insert_closest)
+_engage = njit(cache=True)(_engage)
+build_obs = njit(cache=True)(_build_obs)
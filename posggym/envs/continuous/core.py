@@ -123,6 +123,8 @@ class AbstractContinuousWorld(ABC):
         enable_agent_collisions: bool = True,
     ):
         self.size = size
+        # access via blocks_array property
+        self._blocks_array: Tuple[np.ndarray, np.ndarray] | None = None
         self.blocks = blocks or []
         self.interior_walls = interior_walls or []
         self.agent_radius = agent_radius
@@ -340,6 +342,29 @@ class AbstractContinuousWorld(ABC):
         """Get  (min x, max_x), (min y, max y) bounds of the world."""
         return (0, self.size), (0, self.size)
 
+    @property
+    def blocks(self) -> List[CircleEntity]:
+        """The list of `(position, radius)` of each block in the world."""
+        return self._blocks
+
+    @blocks.setter
+    def blocks(self, blocks: List[CircleEntity]):
+        self._blocks = blocks
+        self._blocks_array = None
+
+    @property
+    def blocks_array(self) -> Tuple[np.ndarray, np.ndarray]:
+        """The `(x, y)` coords and radii of all blocks, as `(n, 2)` and `(n,)` arrays.
+
+        Computed once, so `blocks` should be replaced rather than modified in place.
+        """
+        if self._blocks_array is None:
+            self._blocks_array = (
+                np.array([[pos[0], pos[1]] for pos, _ in self.blocks]).reshape(-1, 2),
+                np.array([s for _, s in self.blocks]),
+            )
+        return self._blocks_array
+
     @property
     def blocked_coords(self) -> Set[Coord]:
         """The set of all integer coordinates that contain at least part of a block."""
@@ -391,9 +416,13 @@ class AbstractContinuousWorld(ABC):
         return angle % (2 * math.pi)
 
     @staticmethod
-    def convert_angle_to_negpi_pi_interval(angle: float) -> float:
-        """Convert angle in radians to be in (-pi, pi] interval."""
+    def convert_angle_to_negpi_pi_interval(
+        angle: float | np.ndarray,
+    ) -> float | np.ndarray:
+        """Convert angle/s in radians to be in (-pi, pi] interval."""
         angle = angle % (2 * math.pi)
+        if isinstance(angle, np.ndarray):
+            return np.where(angle > math.pi, angle - 2 * math.pi, angle)
         if angle > math.pi:
             angle -= 2 * math.pi
         return angle
@@ -639,7 +668,8 @@ class AbstractContinuousWorld(ABC):
         collision_types = np.full(n_rays, CollisionType.NONE.value, dtype=np.uint8)
 
         if other_agents is not None and len(other_agents):
-            radii = np.array([self.agent_radius] * len(other_agents))
+            # match precision of agent coords, so float32 coords stay float32
+            radii = np.full(len(other_agents), self.agent_radius, other_agents.dtype)
             dists = self.check_circle_line_intersection(
                 other_agents, radii, ray_start_coords, ray_end_coords
             )
@@ -652,9 +682,7 @@ class AbstractContinuousWorld(ABC):
             np.fmin(closest_distances, min_dists, out=closest_distances)
 
         if include_blocks and len(self.blocks):
-            radii = np.array([s for _, s in self.blocks])
-            block_array = np.array([[pos[0], pos[1]] for pos, _ in self.blocks])
-
+            block_array, radii = self.blocks_array
             dists = self.check_circle_line_intersection(
                 block_array, radii, ray_start_coords, ray_end_coords
             )
@@ -704,9 +732,46 @@ class AbstractContinuousWorld(ABC):
 
         return closest_distances, collision_types
 
+    def get_circular_rays(
+        self,
+        origin: Position | np.ndarray,
+        ray_distance: float,
+        n_rays: int,
+        use_relative_angle: bool = True,
+        angle_bounds: Tuple[float, float] = (0.0, 2 * np.pi),
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Get start and end coords of rays that radiate away from the origin.
+
+        See `check_collision_circular_rays` for details of arguments. The origin may
+        be a `(x, y, angle)` position or any array whose first three values are
+        `x, y, angle` (e.g. a body state).
+
+        Returns
+        -------
+        ray_start_coords
+            start coords of rays, with shape `(n_rays, 2)`.
+        ray_end_coords
+            end coords of rays, with shape `(n_rays, 2)`.
+
+        """
+        x, y, rel_angle = origin[0], origin[1], origin[2]
+        if not use_relative_angle:
+            rel_angle = 0.0
+
+        angles = np.linspace(
+            angle_bounds[0], angle_bounds[1], n_rays, endpoint=False, dtype=np.float32
+        )
+
+        ray_end_xs = x + ray_distance * np.cos(angles + rel_angle)
+        ray_end_ys = y + ray_distance * np.sin(angles + rel_angle)
+
+        ray_start_coords = np.tile((x, y), (n_rays, 1))
+        ray_end_coords = np.stack([ray_end_xs, ray_end_ys], axis=1)
+        return ray_start_coords, ray_end_coords
+
     def check_collision_circular_rays(
         self,
-        origin: Position,
+        origin: Position | np.ndarray,
         ray_distance: float,
         n_rays: int,
         other_agents: np.ndarray | None = None,
@@ -751,20 +816,9 @@ class AbstractContinuousWorld(ABC):
             `ray_distance`. Array will have shape `(n_rays,)`.
 
         """
-        x, y, rel_angle = origin
-        if not use_relative_angle:
-            rel_angle = 0.0
-
-        angles = np.linspace(
-            angle_bounds[0], angle_bounds[1], n_rays, endpoint=False, dtype=np.float32
+        ray_start_coords, ray_end_coords = self.get_circular_rays(
+            origin, ray_distance, n_rays, use_relative_angle, angle_bounds
         )
-
-        ray_end_xs = x + ray_distance * np.cos(angles + rel_angle)
-        ray_end_ys = y + ray_distance * np.sin(angles + rel_angle)
-
-        ray_start_coords = np.tile((x, y), (n_rays, 1))
-        ray_end_coords = np.stack([ray_end_xs, ray_end_ys], axis=1)
-
         return self.check_ray_collisions(
             ray_start_coords,
             ray_end_coords,
@@ -2,22 +2,20 @@
 
 import math
 import random
-from typing import Any, Dict, List, Optional, Set, Tuple, Union, cast
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 import numpy as np
 import pymunk
 from pymunk import Vec2d
 
-import posggym.model as M
-from posggym.envs.continuous.core import CircleEntity, Coord, FloatCoord, Position
+from posggym.envs.continuous.core import CircleEntity, Coord, FloatCoord
+from posggym.envs.continuous.driving_continuous import (
+    SUPPORTED_WORLDS as STANDARD_WORLDS,
+)
 from posggym.envs.continuous.driving_continuous import (
-    DAction,
-    DObs,
-    DState,
     DrivingContinuousEnv,
     DrivingContinuousModel,
     DrivingWorld,
-    parseworld_str,
 )
 
 
@@ -357,11 +355,6 @@ def parse_random_world_str(
     )
 
 
-# Import at the end to avoid circular imports
-from posggym.envs.continuous.core import PMBodyState
-from posggym.envs.continuous.driving_continuous import SUPPORTED_WORLDS as STANDARD_WORLDS
-
-
 # Define supported worlds for the random environment
 SUPPORTED_RANDOM_WORLDS: Dict[str, Dict[str, Any]] = {
     "14x14Empty": {
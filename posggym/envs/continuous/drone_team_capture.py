@@ -1,6 +1,6 @@
 """The Drone Team Capture Environment."""
 import math
-from typing import Dict, List, NamedTuple, Optional, Tuple, cast
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union, cast
 
 import numpy as np
 from gymnasium import spaces
@@ -8,6 +8,7 @@ from gymnasium import spaces
 import posggym.model as M
 from posggym import logger
 from posggym.core import DefaultEnv
+from posggym.envs.continuous import _drone_team_capture_fast as _fast
 from posggym.envs.continuous.core import (
     CircularContinuousWorld,
     PMBodyState,
@@ -456,10 +457,18 @@ class DroneTeamCaptureModel(M.POSGModel[DTCState, DTCObs, DTCAction]):
         )
 
         # Add physical entities to the world
-        for i in range(self.n_pursuers):
-            self.world.add_entity(f"pursuer_{i}", None, color=self.PURSUER_COLOR)
+        self._pursuer_ids = tuple(f"pursuer_{i}" for i in range(self.n_pursuers))
+        for pursuer_id in self._pursuer_ids:
+            self.world.add_entity(pursuer_id, None, color=self.PURSUER_COLOR)
         self.world.add_entity("evader", None, color=self.EVADER_COLOR)
 
+        # scratch space used when building observations, reused across steps
+        self._obs_scratch = np.empty((4, self.n_pursuers), dtype=np.float64)
+        # (alpha, dist, visible) engagement of the target by each pursuer, and the
+        # distance between them, for the last state observed. Reused as the previous
+        # engagement when stepping from that state
+        self._target_engagement: Optional[Tuple[DTCState, np.ndarray]] = None
+
     def get_agents(self, state: DTCState) -> List[str]:
         return list(self.possible_agents)
 
@@ -484,10 +493,10 @@ class DroneTeamCaptureModel(M.POSGModel[DTCState, DTCObs, DTCAction]):
         pursuer_states = np.zeros(
             (self.n_pursuers, PMBodyState.num_features()), dtype=np.float32
         )
-        for i in range(self.n_pursuers):
-            # distributes the agents based on their index
-            x = 50.0 * (-math.floor(self.n_pursuers / 2) + i) + self.r_arena
-            pursuer_states[i][:3] = (x, self.r_arena, 0.0)
+        # distributes the agents based on their index
+        pursuer_offsets = np.arange(self.n_pursuers) - math.floor(self.n_pursuers / 2)
+        pursuer_states[:, 0] = 50.0 * pursuer_offsets + self.r_arena
+        pursuer_states[:, 1] = self.r_arena
 
         # Target is placed randomly in sphere,
         # excluding area near center where pursuers start
@@ -525,10 +534,12 @@ class DroneTeamCaptureModel(M.POSGModel[DTCState, DTCObs, DTCAction]):
     ) -> M.JointTimestep[DTCState, DTCObs]:
         clipped_actions = clip_actions(actions, self.action_spaces)
         next_state = self._get_next_state(state, clipped_actions)
-        obs = self._get_obs(next_state)
-        all_done, rewards = self._get_rewards(next_state)
-        terminations = {i: all_done for i in self.possible_agents}
-        truncations = {i: False for i in self.possible_agents}
+        obs_array, target_dists = self._get_obs_and_target_dists(next_state, state)
+        obs = dict(zip(self.possible_agents, obs_array))
+        # reuse target distances computed for the observations
+        all_done, rewards = self._get_rewards(next_state, target_dists)
+        terminations = dict.fromkeys(self.possible_agents, all_done)
+        truncations = dict.fromkeys(self.possible_agents, False)
         infos: Dict[str, Dict] = {i: {} for i in self.possible_agents}
         return M.JointTimestep(
             next_state, obs, rewards, terminations, truncations, all_done, infos
@@ -537,15 +548,19 @@ class DroneTeamCaptureModel(M.POSGModel[DTCState, DTCObs, DTCAction]):
     def _get_next_state(
         self, state: DTCState, actions: Dict[str, DTCAction]
     ) -> DTCState:
-        for i in range(self.n_pursuers):
-            self.world.set_entity_state(f"pursuer_{i}", state.pursuer_states[i])
-            velocity_factor = 1 if not self.velocity_control else actions[str(i)][1]
-            pursuer_angle = state.pursuer_states[i][2] + actions[str(i)][0]
+        for pursuer_id, pursuer_state, action in zip(
+            self._pursuer_ids,
+            state.pursuer_states,
+            (actions[i] for i in self.possible_agents),
+        ):
+            self.world.set_entity_state(pursuer_id, pursuer_state)
+            velocity_factor = 1 if not self.velocity_control else action[1]
+            pursuer_angle = pursuer_state[2] + action[0]
             pursuer_vel = self.world.linear_to_xy_velocity(
                 velocity_factor * self.max_pursuer_vel, pursuer_angle
             )
             self.world.update_entity_state(
-                f"pursuer_{i}",
+                pursuer_id,
                 angle=pursuer_angle,
                 vel=pursuer_vel,
             )
@@ -557,10 +572,7 @@ class DroneTeamCaptureModel(M.POSGModel[DTCState, DTCObs, DTCAction]):
         self.world.simulate(1.0 / 10, 10, normalize_angles=True)
 
         next_pursuer_states = np.array(
-            [
-                self.world.get_entity_state(f"pursuer_{i}")
-                for i in range(self.n_pursuers)
-            ],
+            [self.world.get_entity_state(i) for i in self._pursuer_ids],
             dtype=np.float32,
         )
         return DTCState(
@@ -571,191 +583,207 @@ class DroneTeamCaptureModel(M.POSGModel[DTCState, DTCObs, DTCAction]):
             state.target_vel,
         )
 
-    def _get_obs(self, state: DTCState) -> Dict[str, DTCObs]:
-        observation = {}
-        for i in range(self.n_pursuers):
-            # getting the target engagement
-            (alpha_t, dist_t), target_visible = self._engagement(
-                state.pursuer_states[i],
+    def _get_obs(
+        self, state: DTCState, prev_state: Optional[DTCState] = None
+    ) -> Dict[str, DTCObs]:
+        # each agent's observation is a view of its row of the observation array
+        return dict(zip(self.possible_agents, self.get_obs_array(state, prev_state)))
+
+    def get_obs_array(
+        self, state: DTCState, prev_state: Optional[DTCState] = None
+    ) -> np.ndarray:
+        """Get the observations of all pursuers as a single array.
+
+        Row ``i`` is the observation of agent ``possible_agents[i]``, so the returned
+        ``(n_pursuers, obs_dim)`` float32 array can be used directly by code that
+        works with batched observations. ``prev_state`` is the state ``state`` was
+        stepped from, if any, and is only used to reuse work done when observing it.
+        """
+        return self._get_obs_and_target_dists(state, prev_state)[0]
+
+    def _get_obs_and_target_dists(
+        self, state: DTCState, prev_state: Optional[DTCState] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Get observation array and distance from each pursuer to the target."""
+        prev_target_engagement = None
+        if (
+            prev_state is not None
+            and self._target_engagement is not None
+            and self._target_engagement[0] is prev_state
+        ):
+            prev_target_engagement = self._target_engagement[1]
+        target_engagement = np.empty((4, self.n_pursuers), dtype=np.float64)
+        self._target_engagement = (state, target_engagement)
+
+        if _fast.NUMBA_AVAILABLE:
+            obs = np.empty((self.n_pursuers, self.obs_dim), dtype=np.float32)
+            _fast.build_obs(
+                state.pursuer_states,
+                state.prev_pursuer_states,
                 state.target_state,
-                dist_norm_factor=2 * self.r_arena,
-            )
-            (alpha_t_prev, dist_t_prev), target_prev_visible = self._engagement(
-                state.prev_pursuer_states[i],
                 state.prev_target_state,
-                dist_norm_factor=2 * self.r_arena,
+                self.n_com_pursuers,
+                float(self.r_arena),
+                -1.0 if self.observation_limit is None else self.observation_limit,
+                self.norm_max_rel_dist_change,
+                (
+                    np.empty((4, 0), dtype=np.float64)
+                    if prev_target_engagement is None
+                    else prev_target_engagement
+                ),
+                target_engagement,
+                self._obs_scratch,
+                obs,
             )
-            # change in alpha
-            if not target_visible or not target_prev_visible:
-                alpha_rate = -1.0
-                dist_rate = -1.0
-            else:
-                # alpha_t and alpha_t_prev are both normalized into [-1, 1] range
-                # so have to do some shenanigans to ensure alpha rate is correctly
-                # normalized into [-1, 1]
-                alpha_rate = (
-                    self.world.convert_angle_to_negpi_pi_interval(
-                        (alpha_t - alpha_t_prev) * math.pi
-                    )
-                    / math.pi
-                )
-                max_rate = self.norm_max_rel_dist_change
-                dist_rate = self.world.convert_into_interval(
-                    dist_t - dist_t_prev, -max_rate, max_rate, -1.0, 1.0
-                )
+            return obs, target_engagement[3]
 
-            # getting the relative engagement
-            # alpha and distance to each pursuer
-            engagement = []
-            for j in range(self.n_pursuers):
-                if j == i:
-                    eng = (-1.0, -1.0)
-                else:
-                    eng, _ = self._engagement(
-                        state.pursuer_states[i],
-                        state.pursuer_states[j],
-                        dist_norm_factor=2 * self.r_arena,
-                    )
-                engagement.append(eng)
-
-            # Put any invalid (-1) to the end
-            engagement = sorted(
-                engagement, key=lambda t: float("inf") if t[1] == -1.0 else t[1]
-            )
-            alphas, dists = list(zip(*engagement))
+        dist_norm_factor = 2 * self.r_arena
+        pursuers, prev_pursuers = state.pursuer_states, state.prev_pursuer_states
 
-            angle_i = (
-                self.world.convert_angle_to_negpi_pi_interval(
-                    state.pursuer_states[i][2]
-                )
-                / math.pi
-            )
-            prev_angle_i = (
-                self.world.convert_angle_to_negpi_pi_interval(
-                    state.prev_pursuer_states[i][2]
-                )
-                / math.pi
-            )
-            turn_rate = (angle_i - prev_angle_i) / 2
-            xy_i = self.world.convert_into_interval(
-                state.pursuer_states[i][:2], 0.0, 2 * self.r_arena, -1.0, 1.0
+        # getting the target engagement
+        alpha_t, dist_t, target_visible, target_dist = self._engagement_batch(
+            pursuers, state.target_state[None, :], dist_norm_factor
+        )
+        alpha_t, dist_t = alpha_t[:, 0], dist_t[:, 0]
+        target_engagement[0], target_engagement[1] = alpha_t, dist_t
+        target_engagement[2], target_engagement[3] = (
+            target_visible[:, 0],
+            target_dist[:, 0],
+        )
+        if prev_target_engagement is None:
+            alpha_t_prev, dist_t_prev, target_prev_visible, _ = self._engagement_batch(
+                prev_pursuers, state.prev_target_state[None, :], dist_norm_factor
             )
+            alpha_t_prev, dist_t_prev = alpha_t_prev[:, 0], dist_t_prev[:, 0]
+            target_prev_visible = target_prev_visible[:, 0]
+        else:
+            alpha_t_prev, dist_t_prev = prev_target_engagement[:2]
+            target_prev_visible = prev_target_engagement[2] != 0
+        visible = target_visible[:, 0] & target_prev_visible
+
+        # change in alpha
+        # alpha_t and alpha_t_prev are both normalized into [-1, 1] range so have to
+        # ensure alpha rate is correctly normalized, by wrapping their difference from
+        # [-2, 2] into (-1, 1] (i.e. the angle difference into (-pi, pi])
+        alpha_rate = alpha_t - alpha_t_prev
+        alpha_rate = np.where(alpha_rate > 1.0, alpha_rate - 2.0, alpha_rate)
+        alpha_rate = np.where(alpha_rate <= -1.0, alpha_rate + 2.0, alpha_rate)
+        max_rate = self.norm_max_rel_dist_change
+        dist_rate = self.world.convert_into_interval(
+            dist_t - dist_t_prev, -max_rate, max_rate, -1.0, 1.0
+        )
 
-            # Create obs vector
-            obs_i = [
-                angle_i,
-                turn_rate,
-                xy_i[0],
-                xy_i[1],
-                alpha_t,
-                dist_t,
-                alpha_rate,
-                dist_rate,
-            ]
-
-            for idx in range(self.n_com_pursuers):
-                obs_i.append(alphas[idx])
-                obs_i.append(dists[idx])
-
-            observation[str(i)] = np.array(obs_i, dtype=np.float32)
-
-        return observation
-
-    def _engagement(
-        self, agent_i: np.ndarray, agent_j: np.ndarray, dist_norm_factor: float
-    ) -> Tuple[Tuple[float, float], bool]:
-        """Get engagement between two agents.
-
-        Engagement here is the angle (in radians) from agent_i's current position and
-        angle to agent_j's position, as well as the distance between the two agents
+        # getting the relative engagement
+        # alpha and distance from each pursuer (rows) to each other pursuer (cols)
+        alphas, dists, _, _ = self._engagement_batch(
+            pursuers, pursuers, dist_norm_factor
+        )
+        np.fill_diagonal(alphas, -1.0)
+        np.fill_diagonal(dists, -1.0)
+        # Put any invalid (-1) to the end
+        order = np.argsort(
+            np.where(dists == -1.0, np.inf, dists), axis=1, kind="stable"
+        )[:, : self.n_com_pursuers]
+
+        angles = self.world.convert_angle_to_negpi_pi_interval(
+            pursuers[:, 2].astype(np.float64)
+        )
+        prev_angles = self.world.convert_angle_to_negpi_pi_interval(
+            prev_pursuers[:, 2].astype(np.float64)
+        )
+
+        # Create obs vectors
+        obs = np.empty((self.n_pursuers, self.obs_dim), dtype=np.float32)
+        obs[:, 0] = angles / math.pi
+        obs[:, 1] = (angles / math.pi - prev_angles / math.pi) / 2
+        obs[:, 2:4] = self.world.convert_into_interval(
+            pursuers[:, :2], 0.0, 2 * self.r_arena, -1.0, 1.0
+        )
+        obs[:, 4] = alpha_t
+        obs[:, 5] = dist_t
+        obs[:, 6] = np.where(visible, alpha_rate, -1.0)
+        obs[:, 7] = np.where(visible, dist_rate, -1.0)
+        obs[:, 8::2] = np.take_along_axis(alphas, order, axis=1)
+        obs[:, 9::2] = np.take_along_axis(dists, order, axis=1)
+
+        return obs, target_engagement[3]
+
+    def _engagement_batch(
+        self, agents: np.ndarray, targets: np.ndarray, dist_norm_factor: float
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Get engagement between each of a set of agents and each of a set of targets.
+
+        Engagement here is the angle (in radians) from the agent's current position and
+        angle to the target's position, as well as the distance between the two
         positions. Both angle and distance are normalized to [-1, 1] range.
 
-        Note, if agents are outside of observation distance of each other then returns
-        (-1, -1), and False.
+        Returns ``(alpha, dist, visible, raw_dist)`` arrays with shape
+        ``(len(agents), len(targets))``, where ``raw_dist`` is the unnormalized
+        distance. If an agent and target are outside of observation distance of each
+        other then their ``alpha`` and ``dist`` are ``-1`` and ``visible`` is False.
 
         """
-        dist = self.world.euclidean_dist(agent_i, agent_j)
-        if self.observation_limit is not None and dist > self.observation_limit:
-            return (-1.0, -1.0), False
-
-        # Rotation matrix of yaw
-        yaw = agent_i[2]
-        rot = np.array(
-            [[math.cos(yaw), math.sin(yaw)], [-math.sin(yaw), math.cos(yaw)]]
+        rel_xy = (targets[None, :, :2] - agents[:, None, :2]).astype(np.float64)
+        dist = np.sqrt(rel_xy[..., 0] ** 2 + rel_xy[..., 1] ** 2)
+
+        # rotate relative positions by yaw of each agent
+        yaw = agents[:, 2].astype(np.float64)
+        cos_yaw, sin_yaw = np.cos(yaw)[:, None], np.sin(yaw)[:, None]
+        rel_x = cos_yaw * rel_xy[..., 0] + sin_yaw * rel_xy[..., 1]
+        rel_y = -sin_yaw * rel_xy[..., 0] + cos_yaw * rel_xy[..., 1]
+        alpha = self.world.convert_angle_to_negpi_pi_interval(np.arctan2(rel_y, rel_x))
+
+        if self.observation_limit is None:
+            visible = np.ones(dist.shape, dtype=bool)
+            return alpha / math.pi, dist / dist_norm_factor, visible, dist
+        visible = dist <= self.observation_limit
+        return (
+            np.where(visible, alpha / math.pi, -1.0),
+            np.where(visible, dist / dist_norm_factor, -1.0),
+            visible,
+            dist,
         )
-        rel_xy = agent_j[:2] - agent_i[:2]
-        rel_xy = rot.dot(rel_xy)
-        alpha = math.atan2(rel_xy[1], rel_xy[0])
-        alpha = self.world.convert_angle_to_negpi_pi_interval(alpha)
-        return (alpha / math.pi, dist / dist_norm_factor), True
-
-    def _get_rewards(self, state: DTCState) -> Tuple[bool, Dict[str, float]]:
-        done = False
-        reward: Dict[str, float] = {}
+
+    def _get_rewards(
+        self, state: DTCState, target_dists: np.ndarray
+    ) -> Tuple[bool, Dict[str, float]]:
+        """Get rewards given distance from each pursuer to the target."""
         # q_formation reward: [-1 * (n-1) / n, 3 * (n-1) / n]
-        q_formation = self._q_parameter(state) if self.use_q_reward else 0.0
-        for i in self.possible_agents:
-            reward[i] = self.R_Q_COEFF * q_formation
-            # target_dist range = (0.0, 2*r_arena) = (0.0, 860) for default size
-            target_dist = self._target_distance(state, int(i))
-            # target_dist reward = (-1.72, 0.0) for default size
-            reward[i] += self.R_TARGET_DIST_COEFF * target_dist
-            if target_dist < self.capture_radius:
-                done = True
-                reward[i] += self.R_CAPTURE
+        q_formation = (
+            self._q_parameter(state, target_dists) if self.use_q_reward else 0.0
+        )
+        # target_dist range = (0.0, 2*r_arena) = (0.0, 860) for default size
+        # target_dist reward = (-1.72, 0.0) for default size
+        reward = self.R_Q_COEFF * q_formation + self.R_TARGET_DIST_COEFF * target_dists
+        captured = target_dists < self.capture_radius
+        reward[captured] += self.R_CAPTURE
 
+        done = bool(captured.any())
         if done:
             # Large possible reward when done!
-            for i in self.possible_agents:
-                reward[i] += self.R_CAPTURE_TEAM
+            reward += self.R_CAPTURE_TEAM
 
-        return done, reward
+        return done, dict(zip(self.possible_agents, reward.tolist()))
 
-    def _q_parameter(self, state: DTCState) -> float:
+    def _q_parameter(self, state: DTCState, target_dists: np.ndarray) -> float:
         """Calculate Q-formation value."""
         # min = -1 * (n-1) / n, max = 3 * (n-1) / n
-        closest = self._get_closest_pursuer(state)
-        unit = self._get_unit_vectors(state)
+        closest = int(np.argmin(target_dists))
+        # unit vectors between target and each pursuer
+        rel_target = state.target_state[:2] - state.pursuer_states[:, :2]
+        unit = rel_target / target_dists[:, None]
+        closest_x, closest_y = unit[closest].tolist()
         Qk = 0.0
-        for i in range(self.n_pursuers):
+        for i, (unit_x, unit_y) in enumerate(unit.tolist()):
             if i != closest:
-                Qk += np.dot(unit[i], unit[closest]) + 1.0
+                Qk += unit_x * closest_x + unit_y * closest_y + 1.0
         Qk /= self.n_pursuers
         return Qk
 
-    def _get_closest_pursuer(self, state: DTCState) -> int:
-        """Get closest pursuer to target."""
-        min_dist, min_index = None, None
-        for idx in range(len(state.pursuer_states)):
-            dist = self._target_distance(state, idx)
-            if min_dist is None or dist < min_dist:
-                min_index = idx
-                min_dist = dist
-        if min_dist is None or min_index is None:
-            raise Exception("No closest index found. Something has gone wrong.")
-        return min_index
-
-    def _get_unit_vectors(self, state: DTCState) -> List[List[float]]:
-        """Get unit vectors between target and each pursuer."""
-        unit = []
-        q = state.target_state[:2]
-        for p in state.pursuer_states:
-            dist = self.world.euclidean_dist(p, state.target_state)
-            unit.append([(q[0] - p[0]) / dist, (q[1] - p[1]) / dist])
-        return unit
-
     def _get_target_move_repulsive(self, state: DTCState) -> Tuple[float, float]:
         xy_pos = state.target_state[:2]
         x, y = xy_pos
 
-        def scale_fn(z):
-            return 50000 / (abs(z) + 200) ** 2
-
-        final_vector = [0.0, 0.0]
-        for s in state.pursuer_states:
-            vector = s[:2] - xy_pos
-            final_vector = self._scale_vector(vector, scale_fn, final_vector)
-
         # Find closest point on border then put it in to the vectorial sum
         # Noting coords are with origin at top left, so must translate to where origin
         # is center of circle to get closest point on border, then translate back before
@@ -765,29 +793,30 @@ class DroneTeamCaptureModel(M.POSGModel[DTCState, DTCObs, DTCAction]):
             self.r_arena + self.r_arena * math.cos(gamma),
             self.r_arena - self.r_arena * math.sin(gamma),
         ]
-        vector = virtual_wall - xy_pos
-        final_vector = self._scale_vector(
-            vector, scale_fn, final_vector, 0.5 * len(state.pursuer_states)
+        wall_vector = virtual_wall - xy_pos
+
+        # vectors to each pursuer are scaled at the precision of the states
+        pursuer_vectors = state.pursuer_states[:, :2] - xy_pos
+        pursuer_sums = np.abs(pursuer_vectors).sum(axis=1, dtype=np.float64)
+        pursuer_scales = self._repulsive_scales(pursuer_sums, 1.0)
+        pursuer_vectors *= pursuer_scales.astype(pursuer_vectors.dtype)[:, None]
+
+        wall_scale = self._repulsive_scales(
+            np.abs(wall_vector).sum(), 0.5 * len(state.pursuer_states)
+        )
+        final_vector = (
+            pursuer_vectors.sum(axis=0, dtype=np.float64) + wall_scale * wall_vector
         )
 
-        scaled_move_dir = [v / self._abs_sum(final_vector) for v in final_vector]
-        dx, dy = scaled_move_dir[0], scaled_move_dir[1]
+        dx, dy = final_vector / (abs(final_vector[0]) + abs(final_vector[1]))
         d = np.linalg.norm([dx, dy])
         dx = float(state.target_vel * dx / d)
         dy = float(state.target_vel * dy / d)
         return dx, dy
 
-    def _scale_vector(self, vector, scale_fn, final_vector, factor=1.0) -> List[float]:
-        vec_sum = self._abs_sum(vector)
-        div = max(0.00001, vec_sum)
-        f = -factor * scale_fn(vec_sum) / div
-        vector = f * vector
-        return [x + y for x, y in zip(final_vector, vector)]
-
-    def _abs_sum(self, vector: List[float]) -> float:
-        return sum([abs(x) for x in vector])
-
-    def _target_distance(self, state: DTCState, pursuer_idx: int) -> float:
-        return self.world.euclidean_dist(
-            state.pursuer_states[pursuer_idx], state.target_state
-        )
+    @staticmethod
+    def _repulsive_scales(
+        vec_sums: Union[float, np.ndarray], factor: float
+    ) -> Union[float, np.ndarray]:
+        """Get scale factor for repulsive vectors with given L1 norms."""
+        return -factor * (50000 / (vec_sums + 200) ** 2) / np.maximum(0.00001, vec_sums)
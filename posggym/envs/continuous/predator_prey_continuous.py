@@ -492,16 +492,14 @@ class PredatorPreyContinuousModel(M.POSGModel[PPState, PPObs, PPAction]):
         predator_states = np.zeros(
             (self.num_predators, PMBodyState.num_features()), dtype=np.float32
         )
-        for i in range(self.num_predators):
-            predator_states[i][:3] = predator_positions[i]
+        predator_states[:, :3] = predator_positions[: self.num_predators]
 
         prey_positions = [*self.world.prey_start_positions]
         self.rng.shuffle(prey_positions)
         prey_states = np.zeros(
             (self.num_prey, PMBodyState.num_features()), dtype=np.float32
         )
-        for i in range(self.num_prey):
-            prey_states[i][:3] = prey_positions[i]
+        prey_states[:, :3] = prey_positions[: self.num_prey]
 
         return PPState(
             predator_states,
@@ -521,9 +519,9 @@ class PredatorPreyContinuousModel(M.POSGModel[PPState, PPObs, PPAction]):
         obs = self.get_obs(next_state)
         rewards = self._get_rewards(state, next_state)
 
-        all_done = all(next_state.prey_caught)
-        truncated = {i: False for i in self.possible_agents}
-        terminated = {i: all_done for i in self.possible_agents}
+        all_done = bool(next_state.prey_caught.all())
+        truncated = dict.fromkeys(self.possible_agents, False)
+        terminated = dict.fromkeys(self.possible_agents, all_done)
 
         info: Dict[str, Dict] = {i: {} for i in self.possible_agents}
         if all_done:
@@ -656,40 +654,40 @@ class PredatorPreyContinuousModel(M.POSGModel[PPState, PPObs, PPAction]):
 
     def _get_local_obs(self, agent_id: str, state: PPState) -> np.ndarray:
         state_i = state.predator_states[int(agent_id)]
-        pos_i = (state_i[0], state_i[1], state_i[2])
+        # same sensor rays are checked against prey, predators, and obstacles
+        ray_starts, ray_ends = self.world.get_circular_rays(
+            state_i, self.obs_dist, self.n_sensors, use_relative_angle=True
+        )
 
         prey_coords = state.prey_states[state.prey_caught == 0, :2]
-        prey_obs, _ = self.world.check_collision_circular_rays(
-            pos_i,
+        prey_obs, _ = self.world.check_ray_collisions(
+            ray_starts,
+            ray_ends,
             self.obs_dist,
-            self.n_sensors,
             prey_coords,
             include_blocks=False,
             check_walls=False,
-            use_relative_angle=True,
         )
 
         mask = np.ones(len(state.predator_states), dtype=bool)
         mask[int(agent_id)] = False
         pred_coords = state.predator_states[mask, :2]
-        pred_obs, _ = self.world.check_collision_circular_rays(
-            pos_i,
+        pred_obs, _ = self.world.check_ray_collisions(
+            ray_starts,
+            ray_ends,
             self.obs_dist,
-            self.n_sensors,
             pred_coords,
             include_blocks=False,
             check_walls=False,
-            use_relative_angle=True,
         )
 
-        obstacle_obs, _ = self.world.check_collision_circular_rays(
-            pos_i,
+        obstacle_obs, _ = self.world.check_ray_collisions(
+            ray_starts,
+            ray_ends,
             self.obs_dist,
-            self.n_sensors,
             other_agents=None,
             include_blocks=True,
             check_walls=True,
-            use_relative_angle=True,
         )
 
         obs = np.full((self.obs_dim,), self.obs_dist, dtype=np.float32)
@@ -750,50 +748,49 @@ class PPWorld(SquareContinuousWorld):
             enable_agent_collisions=True,
         )
 
+        block_coords, block_radii = self.blocks_array
         if predator_start_positions is None:
-            predator_start_positions = []
-            for col, row in product([0, size // 2, size - 1], repeat=2):
-                if col not in (0, size - 1) and row not in (0, size - 1):
-                    continue
-                x, y = col + self.agent_radius, row + self.agent_radius
-                invalid_pos = False
-                for block_pos, block_size in self.blocks:
-                    dist = self.euclidean_dist((x, y, 0.0), block_pos)
-                    if dist <= self.agent_radius + block_size:
-                        invalid_pos = True
-                        break
-                if not invalid_pos:
-                    predator_start_positions.append((x, y, 0.0))
+            # predators start in the corners and half-way along each side, away from
+            # any block
+            cols, rows = np.meshgrid(
+                [0, size // 2, size - 1], [0, size // 2, size - 1], indexing="ij"
+            )
+            on_edge = np.isin(cols, (0, size - 1)) | np.isin(rows, (0, size - 1))
+            coords = np.stack([cols[on_edge], rows[on_edge]], axis=1)
+            coords = coords + self.agent_radius
+            block_dists = self._pairwise_dists(coords, block_coords)
+            valid = ~np.any(block_dists <= self.agent_radius + block_radii, axis=1)
+            predator_start_positions = [(x, y, 0.0) for x, y in coords[valid].tolist()]
 
         self.predator_start_positions = predator_start_positions
 
         if prey_start_positions is None:
             # prey can start anywhere at least distance 2 * self.agent size away from
             # any predator (i.e. an agent wide gap from any predator)
-            # Not very efficient, but only needs to be run once at the start
-            prey_start_positions = []
-            for col, row in product(range(size), range(size)):
-                if col in (0, size - 1) or row in (0, size - 1):
-                    continue
-                x, y = col + self.agent_radius, row + self.agent_radius
-                invalid_pos = False
-                for pred_pos in self.predator_start_positions:
-                    dist = self.euclidean_dist((x, y), pred_pos)
-                    if dist < 2 * self.agent_radius:
-                        invalid_pos = True
-                        break
-                if invalid_pos:
-                    continue
-                for block_pos, block_size in self.blocks:
-                    dist = self.euclidean_dist((x, y), block_pos)
-                    if dist < self.agent_radius + block_size:
-                        invalid_pos = True
-                        break
-                if not invalid_pos:
-                    prey_start_positions.append((x, y, 0.0))
+            cols, rows = np.meshgrid(
+                np.arange(1, size - 1), np.arange(1, size - 1), indexing="ij"
+            )
+            coords = np.stack([cols.ravel(), rows.ravel()], axis=1)
+            coords = coords + self.agent_radius
+            pred_coords = np.array(
+                [pos[:2] for pos in self.predator_start_positions], dtype=np.float64
+            ).reshape(-1, 2)
+            pred_dists = self._pairwise_dists(coords, pred_coords)
+            block_dists = self._pairwise_dists(coords, block_coords)
+            valid = ~(
+                np.any(pred_dists < 2 * self.agent_radius, axis=1)
+                | np.any(block_dists < self.agent_radius + block_radii, axis=1)
+            )
+            prey_start_positions = [(x, y, 0.0) for x, y in coords[valid].tolist()]
 
         self.prey_start_positions = prey_start_positions
 
+    @staticmethod
+    def _pairwise_dists(coords: np.ndarray, other_coords: np.ndarray) -> np.ndarray:
+        """Get Euclidean distance between each pair of `(x, y)` coords."""
+        diffs = coords[:, None, :] - other_coords[None, :, :]
+        return np.sqrt(diffs[..., 0] ** 2 + diffs[..., 1] ** 2)
+
     def copy(self) -> "PPWorld":
         world = PPWorld(
             size=int(self.size),
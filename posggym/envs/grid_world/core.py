@@ -116,6 +116,18 @@ class Grid:
         self, origin: Coord, dist: int, ignore_blocks: bool, include_origin: bool
     ) -> Set[Coord]:
         """Get set of coords within given distance from origin."""
+        return self._get_coords_within_dist(
+            origin, dist, ignore_blocks, include_origin, {}
+        )
+
+    def _get_coords_within_dist(
+        self,
+        origin: Coord,
+        dist: int,
+        ignore_blocks: bool,
+        include_origin: bool,
+        memo: Dict[Tuple[Coord, int], Set[Coord]],
+    ) -> Set[Coord]:
         if dist == 0:
             return {origin} if include_origin else set()
 
@@ -129,9 +141,15 @@ class Grid:
             return in_dist_coords
 
         for coord in adj_coords:
-            in_dist_coords.update(
-                self.get_coords_within_dist(coord, dist - 1, ignore_blocks, False)
-            )
+            # the same coord is reached from many directions, so only expand it once
+            # for each distance. Sets are still built in the same order, so iteration
+            # order (and so any seeded sampling from them) is unchanged
+            key = (coord, dist - 1)
+            if key not in memo:
+                memo[key] = self._get_coords_within_dist(
+                    coord, dist - 1, ignore_blocks, False, memo
+                )
+            in_dist_coords.update(memo[key])
 
         if not include_origin and origin in in_dist_coords:
             # must remove since it will get added again during recursive call
@@ -1,6 +1,7 @@
 """The Driving Grid World Environment."""
 
 import enum
+import functools
 from itertools import product
 from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple, Union
 
@@ -396,9 +397,7 @@ class DrivingModel(M.POSGModel[DState, DObs, DAction]):
                 f"Driving grid `{grid}` does not support {num_agents} agents. The "
                 f"supported number of agents is from 1 up to {supported_num_agents}."
             )
-            grid = parse_grid_str(
-                grid_info["grid_str"], grid_info["supported_num_agents"]
-            )
+            grid = _load_grid(grid)
         else:
             assert 0 < num_agents <= grid.supported_num_agents, (
                 f"Supplied DrivingGrid `{grid}` does not support {num_agents} agents. "
@@ -1089,3 +1088,14 @@ SUPPORTED_GRIDS: Dict[str, Dict[str, Any]] = {
         "max_episode_steps": 50,
     },
 }
+
+
+@functools.lru_cache(maxsize=None)
+def _load_grid(grid_name: str) -> DrivingGrid:
+    """Load supported grid with given name.
+
+    Grids are only read by the environment, so each grid (along with its precomputed
+    shortest paths) is constructed once and shared between environment instances.
+    """
+    grid_info = SUPPORTED_GRIDS[grid_name]
+    return parse_grid_str(grid_info["grid_str"], grid_info["supported_num_agents"])
@@ -452,8 +452,8 @@ class PredatorPreyModel(M.POSGModel[PPState, PPObs, PPAction]):
         rewards = self._get_rewards(state, next_state)
 
         all_done = all(next_state.prey_caught)
-        truncated = {i: False for i in self.possible_agents}
-        terminated = {i: all_done for i in self.possible_agents}
+        truncated = dict.fromkeys(self.possible_agents, False)
+        terminated = dict.fromkeys(self.possible_agents, all_done)
 
         info: Dict[str, Dict] = {i: {} for i in self.possible_agents}
         if all_done:
@@ -690,28 +690,36 @@ class PredatorPreyModel(M.POSGModel[PPState, PPObs, PPAction]):
         self, agent_idx: int, state: PPState, next_state: PPState
     ) -> Tuple[int, ...]:
         obs_size = (2 * self.obs_dim) + 1
-        agent_coord = next_state.predator_coords[agent_idx]
+        agent_col, agent_row = next_state.predator_coords[agent_idx]
+        min_col, min_row = agent_col - self.obs_dim, agent_row - self.obs_dim
+        # bound to locals since they are used for every observed cell
+        width, height = self.grid.width, self.grid.height
+        block_coords = self.grid.block_coords
+        predator_coords = next_state.predator_coords
+        # coords of previously caught prey are empty
+        prey_coords = {
+            c
+            for c, caught in zip(next_state.prey_coords, state.prey_caught)
+            if not caught
+        }
 
         cell_obs = []
-        for row, col in product(range(obs_size), repeat=2):
-            obs_grid_coord = self._map_obs_to_grid_coord((col, row), agent_coord)
-            if obs_grid_coord is None or obs_grid_coord in self.grid.block_coords:
-                cell_obs.append(WALL)
-            elif obs_grid_coord in next_state.predator_coords:
-                cell_obs.append(PREDATOR)
-            elif obs_grid_coord in next_state.prey_coords:
-                prey_obs_added = False
-                for i, c in enumerate(next_state.prey_coords):
-                    if c != obs_grid_coord or state.prey_caught[i]:
-                        continue
+        for grid_row in range(min_row, min_row + obs_size):
+            row_in_bounds = 0 <= grid_row < height
+            for grid_col in range(min_col, min_col + obs_size):
+                obs_grid_coord = (grid_col, grid_row)
+                if (
+                    not row_in_bounds
+                    or not 0 <= grid_col < width
+                    or obs_grid_coord in block_coords
+                ):
+                    cell_obs.append(WALL)
+                elif obs_grid_coord in predator_coords:
+                    cell_obs.append(PREDATOR)
+                elif obs_grid_coord in prey_coords:
                     cell_obs.append(PREY)
-                    prey_obs_added = True
-                    break
-                if not prey_obs_added:
-                    # coord is for previously caught prey and is now empty
+                else:
                     cell_obs.append(EMPTY)
-            else:
-                cell_obs.append(EMPTY)
         return tuple(cell_obs)
 
     def _map_obs_to_grid_coord(
@@ -832,7 +840,7 @@ class PredatorPreyGrid(Grid):
             # not the most efficient as it repeats work,
             # but function should only be called once when model is initialized
             # and for small num
-            for c in coords:
+            for c in list(coords):
                 coords.update(
                     self.get_neighbours(
                         c, ignore_blocks=False, include_out_of_bounds=False
@@ -1,5 +1,6 @@
 """The Pursuit-Evasion Grid World Environment."""
 
+import functools
 from collections import deque
 from typing import Any, Deque, Dict, List, NamedTuple, Optional, Set, Tuple, Union, cast
 
@@ -369,7 +370,7 @@ class PursuitEvasionModel(M.POSGModel[PEState, PEObs, PEAction]):
                 f"Unsupported grid name '{grid}'. If grid is a string it must be one "
                 f"of: {SUPPORTED_GRIDS.keys()}."
             )
-            grid = SUPPORTED_GRIDS[grid][0]()
+            grid = _load_grid(grid)
 
         self._grid = grid
         self.max_obs_distance = max_obs_distance
@@ -1017,3 +1018,13 @@ SUPPORTED_GRIDS = {
     "16x16": (get_16x16_grid, 100),
     "32x32": (get_32x32_grid, 200),
 }
+
+
+@functools.lru_cache(maxsize=None)
+def _load_grid(grid_name: str) -> PEGrid:
+    """Load supported grid with given name.
+
+    Grids are only read by the environment, so each grid (along with its precomputed
+    shortest paths) is constructed once and shared between environment instances.
+    """
+    return SUPPORTED_GRIDS[grid_name][0]()
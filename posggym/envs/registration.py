@@ -450,7 +450,8 @@ def register(
             )
         ns_id = current_namespace
 
-    full_id = get_env_id(ns_id, name, version)
+    # interned so ``make`` lookups with literal ids can short-circuit on identity
+    full_id = sys.intern(get_env_id(ns_id, name, version))
 
     new_spec = EnvSpec(
         id=full_id,
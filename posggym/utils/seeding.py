@@ -6,7 +6,7 @@ https://github.com/Farama-Foundation/Gymnasium/blob/v0.27.0/gymnasium/utils/seed
 """
 
 import random
-from typing import Optional, Tuple, Union
+from typing import List, Optional, Tuple, Type, Union
 
 import numpy as np
 
@@ -16,13 +16,18 @@ from posggym import error
 RNG = Union[random.Random, np.random.Generator]
 
 
-def np_random(seed: Optional[int] = None) -> Tuple[np.random.Generator, int]:
+def np_random(
+    seed: Optional[int] = None,
+    bit_generator: Type[np.random.BitGenerator] = np.random.PCG64,
+) -> Tuple[np.random.Generator, int]:
     """Create a numpy random number generator.
 
     Arguments
     ---------
     seed : int, optional
         the seed used to create the generator.
+    bit_generator : Type[np.random.BitGenerator], optional
+        the bit generator used by the generator (default=`np.random.PCG64`).
 
     Returns
     -------
@@ -51,10 +56,46 @@ def np_random(seed: Optional[int] = None) -> Tuple[np.random.Generator, int]:
     np_seed = seed_seq.entropy
     # np_seed should always be an int if seed is an int | None
     assert isinstance(np_seed, int)
-    rng = np.random.Generator(np.random.PCG64(seed_seq))
+    rng = np.random.Generator(bit_generator(seed_seq))
     return rng, np_seed
 
 
+def np_random_streams(
+    seed: Optional[int] = None, num_streams: int = 1
+) -> Tuple[List[np.random.Generator], int]:
+    """Create independent numpy random number generators from a single seed.
+
+    Each generator uses the counter-based `np.random.Philox` bit generator, jumped
+    ahead by its index, so the streams never overlap and stream ``i`` is the same
+    for a given seed regardless of the number of streams.
+
+    Arguments
+    ---------
+    seed : int, optional
+        the seed used to create the generators.
+    num_streams : int, optional
+        the number of generators to create (default=1).
+
+    Returns
+    -------
+    rngs : List[np.random.Generator]
+        the random number generators
+    seed : int
+        the seed used for the rngs (will equal argument seed if one is provided.)
+
+    Raises
+    ------
+    Error
+        if seed is not None or a non-negative integer.
+
+    """
+    rng, np_seed = np_random(seed, np.random.Philox)
+    rngs = [
+        np.random.Generator(rng.bit_generator.jumped(i)) for i in range(num_streams)
+    ]
+    return rngs, np_seed
+
+
 def std_random(seed: Optional[int] = None) -> Tuple[random.Random, int]:
     """Create random number generator using python built-in `random.Random`.
 
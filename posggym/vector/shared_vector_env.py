@@ -0,0 +1,595 @@
+"""Vectorized environment that runs sub-environments in parallel processes.
+
+Based on Gymnasium Vectorized Environments:
+https://github.com/Farama-Foundation/Gymnasium/blob/main/gymnasium/vector/async_vector_env.py
+
+"""
+
+from __future__ import annotations
+
+import contextlib
+import multiprocessing as mp
+import sys
+from copy import deepcopy
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+import numpy as np
+from gymnasium.vector.utils import (
+    CloudpickleWrapper,
+    create_shared_memory,
+    read_from_shared_memory,
+    write_to_shared_memory,
+)
+from gymnasium.vector.utils.spaces import batch_space
+
+import posggym
+from posggym.vector.sync_vector_env import SyncVectorEnv
+
+
+if TYPE_CHECKING:
+    from gymnasium import spaces
+
+
+class SharedVectorEnv(posggym.Env):
+    """Vectorized environment that runs each sub-environment in its own process.
+
+    Has the same API as :class:`posggym.vector.SyncVectorEnv`, including autoreset of
+    done sub-environments, but each sub-environment is run in a separate worker
+    process so sub-environments are stepped in parallel.
+
+    The observations, actions, rewards, and termination, truncation and done signals
+    are exchanged with the worker processes through shared memory. Each worker writes
+    directly into its slot of the batched arrays, so none of these are pickled when
+    stepping the environment. Only the commands sent to the workers and the infos
+    returned by the sub-environments are sent through pipes.
+
+    Observation and action spaces of the sub-environments must be supported by
+    :func:`gymnasium.vector.utils.create_shared_memory` (i.e. ``Box``, ``Discrete``,
+    ``MultiDiscrete``, ``MultiBinary``, and ``Tuple`` and ``Dict`` spaces of these).
+
+    Sub-environments can be double-buffered, by splitting them into groups and
+    stepping one group while actions are computed for another. :meth:`step_async`
+    can be called again before :meth:`step_wait` with a disjoint group of
+    sub-environments, and each :meth:`step_wait` returns the results for the earliest
+    group still pending::
+
+        env = SharedVectorEnv(env_fns, copy=False)
+        n = env.num_envs
+        groups = [range(0, n // 2), range(n // 2, n)]
+        obs, _ = env.reset()
+        env.step_async(policy(obs), groups[0])
+        env.step_async(policy(obs), groups[1])
+        for t in range(num_steps):
+            obs, rewards, terminateds, truncateds, dones, infos = env.step_wait()
+            env.step_async(policy(obs), groups[t % 2])
+
+    While other groups are pending only the entries for the waited for group are
+    valid in the returned arrays.
+
+    Note
+    ----
+    Forking a process that has initialized multi-threaded libraries (e.g. compiled
+    parallel ``numba`` kernels or ``jax``) can deadlock. In that case use the
+    ``"forkserver"`` or ``"spawn"`` ``context``. If no ``context`` is given and the
+    default start method is ``"fork"``, then ``"forkserver"`` (or ``"spawn"`` where
+    it isn't available) is used instead once ``numba``'s threading layer has been
+    started in this process, e.g. by the batched MultiAccessBroadcastChannel
+    kernels. Both of these start methods require the script creating the environment
+    to be importable (i.e. to guard its entry point with
+    ``if __name__ == "__main__":``).
+
+    """
+
+    def __init__(
+        self,
+        env_fns: Iterable[Callable[[], posggym.Env]],
+        copy: bool = True,
+        context: str | None = None,
+    ):
+        """Initialize the vectorized environment.
+
+        Arguments
+        ---------
+        env_fns
+            iterable of callable functions that create the environments.
+        copy
+            If ``True``, then the :meth:`reset` and :meth:`step` methods return a
+            copy of the observations, rewards, and signals. Otherwise they return
+            views into the shared memory, which are overwritten by the next call to
+            :meth:`reset` or :meth:`step`.
+        context
+            Context for `multiprocessing`_. If ``None``, then the default context is
+            used, unless it is ``"fork"`` and ``numba``'s threading layer has been
+            started, in which case ``"forkserver"`` is used.
+
+        .. _multiprocessing: https://docs.python.org/3/library/multiprocessing.html
+
+        """
+        if (
+            context is None
+            and mp.get_context().get_start_method() == "fork"
+            and _numba_threads_started()
+        ):
+            # forking once numba's threading layer has started can deadlock
+            context = (
+                "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+            )
+        ctx = mp.get_context(context)
+        self.env_fns = list(env_fns)
+        self.copy = copy
+        self.is_vector_env = True
+        self.num_envs = len(self.env_fns)
+
+        dummy_env = self.env_fns[0]()
+        self.metadata = dummy_env.metadata
+        self.model = dummy_env.model
+        self._possible_agents = dummy_env.possible_agents
+        self.single_observation_spaces = dummy_env.observation_spaces
+        self.single_action_spaces = dummy_env.action_spaces
+        dummy_env.close()
+        del dummy_env
+
+        self._observation_spaces = {
+            i: batch_space(self.single_observation_spaces[i], n=self.num_envs)
+            for i in self.single_observation_spaces
+        }
+        self._action_spaces = {
+            i: batch_space(self.single_action_spaces[i], n=self.num_envs)
+            for i in self.single_action_spaces
+        }
+
+        agent_ids = tuple(self.single_observation_spaces)
+        num_signals = len(agent_ids) * self.num_envs
+        self._shared_memory = {
+            "observations": {
+                i: create_shared_memory(space, n=self.num_envs, ctx=ctx)
+                for i, space in self.single_observation_spaces.items()
+            },
+            "actions": {
+                i: create_shared_memory(space, n=self.num_envs, ctx=ctx)
+                for i, space in self.single_action_spaces.items()
+            },
+            "rewards": ctx.Array("f", num_signals, lock=False),
+            "terminateds": ctx.Array("b", num_signals, lock=False),
+            "truncateds": ctx.Array("b", num_signals, lock=False),
+            "all_dones": ctx.Array("b", self.num_envs, lock=False),
+        }
+        (
+            self.observations,
+            self._actions,
+            self._rewards,
+            self._terminateds,
+            self._truncateds,
+            self._all_dones,
+        ) = _shared_memory_views(
+            self._shared_memory,
+            self.single_observation_spaces,
+            self.single_action_spaces,
+            self.num_envs,
+        )
+
+        self.parent_pipes, self.processes = [], []
+        for idx, env_fn in enumerate(self.env_fns):
+            parent_pipe, child_pipe = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker,
+                name=f"Worker<{type(self).__name__}>-{idx}",
+                args=(
+                    idx,
+                    CloudpickleWrapper(env_fn),
+                    child_pipe,
+                    parent_pipe,
+                    self._shared_memory,
+                    self.num_envs,
+                ),
+                daemon=True,
+            )
+            self.parent_pipes.append(parent_pipe)
+            self.processes.append(process)
+            process.start()
+            child_pipe.close()
+        self.closed = False
+        # groups of sub-environments being stepped, in the order they were sent
+        self._pending_env_ids: List[List[int]] = []
+        # sub-environments whose worker has exited after an error
+        self._failed_env_ids: Set[int] = set()
+
+        self._check_spaces()
+
+    def reset(
+        self,
+        *,
+        seed: int | None | List[int] = None,
+        options: Dict[str, Any] | None = None,
+    ):
+        """Reset all environments and return batch of initial observations and info."""
+        self._assert_not_pending("reset")
+        if seed is None:
+            seed = [None for _ in range(self.num_envs)]
+        elif isinstance(seed, int):
+            seed = [seed + i for i in range(self.num_envs)]
+        assert len(seed) == self.num_envs
+
+        for pipe, s in zip(self.parent_pipes, seed):
+            pipe.send(("reset", {"seed": s, "options": options}))
+        infos = self._collect_infos(self._receive())
+
+        return (deepcopy(self.observations) if self.copy else self.observations), infos
+
+    def step_async(self, actions, env_ids: Sequence[int] | None = None):
+        """Send the actions to the sub-environments to step them.
+
+        The results must be retrieved using :meth:`step_wait` before any method other
+        than :meth:`step_async` is called. See :meth:`step` for the expected format of
+        ``actions`` and ``env_ids``, only the actions of the ``env_ids``
+        sub-environments are used.
+
+        May be called again before :meth:`step_wait` to step another group of
+        sub-environments, as long as none of ``env_ids`` are still pending.
+        """
+        env_ids = list(range(self.num_envs) if env_ids is None else env_ids)
+        is_idle = np.ones(self.num_envs, dtype=bool)
+        for pending_env_ids in self._pending_env_ids:
+            is_idle[pending_env_ids] = False
+        if not is_idle[env_ids].all():
+            raise RuntimeError(
+                "Calling `step_async` for sub-environments that are still pending, "
+                "call `step_wait` first."
+            )
+
+        # sub-environments not being stepped have no reward and are not done
+        is_idle[env_ids] = False
+        for i in self.single_observation_spaces:
+            self._rewards[i][is_idle] = 0
+            self._terminateds[i][is_idle] = False
+            self._truncateds[i][is_idle] = False
+        self._all_dones[is_idle] = False
+
+        for i, space in self.single_action_spaces.items():
+            _write_batch(
+                space,
+                actions[i],
+                self._actions[i],
+                self._shared_memory["actions"][i],
+                env_ids,
+            )
+        self._pending_env_ids.append(env_ids)
+        for env_num in env_ids:
+            self.parent_pipes[env_num].send(("step", None))
+
+    def step_wait(self):
+        """Wait for the sub-environments to step and return the batched results.
+
+        Waits for the earliest group of sub-environments sent by :meth:`step_async`
+        that is still pending. See :meth:`step` for the returned values.
+        """
+        if not self._pending_env_ids:
+            raise RuntimeError(
+                "Calling `step_wait` without any pending call to `step_async`."
+            )
+        env_ids = self._pending_env_ids.pop(0)
+        infos = self._collect_infos(self._receive(env_ids), env_ids)
+        return (
+            (deepcopy(self.observations) if self.copy else self.observations),
+            deepcopy(self._rewards) if self.copy else self._rewards,
+            deepcopy(self._terminateds) if self.copy else self._terminateds,
+            deepcopy(self._truncateds) if self.copy else self._truncateds,
+            deepcopy(self._all_dones) if self.copy else self._all_dones,
+            infos,
+        )
+
+    def step(self, actions, env_ids: Sequence[int] | None = None):
+        """Take a step in all environments with the given actions.
+
+        Same as :meth:`posggym.vector.SyncVectorEnv.step`, except the sub-environments
+        are stepped in parallel. If ``env_ids`` is given then only those
+        sub-environments are sent a step command.
+        """
+        self._assert_not_pending("step")
+        self.step_async(actions, env_ids)
+        return self.step_wait()
+
+    def render(self):
+        return self.call("render")
+
+    def close(self):
+        """Close all environments and shut down the worker processes."""
+        if self.closed:
+            return
+        while self._pending_env_ids:
+            # any failed workers are recorded, and skipped below
+            with contextlib.suppress(RuntimeError, EOFError):
+                self._receive(self._pending_env_ids.pop(0))
+
+        open_pipes = [
+            pipe
+            for env_num, pipe in enumerate(self.parent_pipes)
+            if env_num not in self._failed_env_ids
+        ]
+        for pipe in open_pipes:
+            with contextlib.suppress(BrokenPipeError):
+                pipe.send(("close", None))
+        for pipe in open_pipes:
+            with contextlib.suppress(BrokenPipeError, EOFError):
+                pipe.recv()
+        for pipe in self.parent_pipes:
+            pipe.close()
+        for process in self.processes:
+            process.join()
+        self.closed = True
+
+    def call(self, name: str, *args, **kwargs) -> Tuple:
+        """Call a method on all environments and return the results."""
+        self._assert_not_pending("call")
+        for pipe in self.parent_pipes:
+            pipe.send(("call", (name, args, kwargs)))
+        return tuple(self._receive())
+
+    @property
+    def possible_agents(self) -> Tuple[str, ...]:
+        return self._possible_agents
+
+    @property
+    def agents(self):
+        return self.call("agents")
+
+    @property
+    def state(self):
+        return self.call("state")
+
+    @property
+    def observation_spaces(self):
+        return self._observation_spaces
+
+    @property
+    def action_spaces(self):
+        return self._action_spaces
+
+    def _assert_not_pending(self, name: str):
+        if self._pending_env_ids:
+            raise RuntimeError(
+                f"Calling `{name}` while waiting for a pending call to `step_async`, "
+                "call `step_wait` first."
+            )
+
+    _add_info = SyncVectorEnv._add_info
+    _init_info_arrays = SyncVectorEnv._init_info_arrays
+
+    def _collect_infos(
+        self,
+        env_infos: Sequence[Dict[str, Dict]],
+        env_ids: Sequence[int] | None = None,
+    ) -> Dict[str, Dict]:
+        if env_ids is None:
+            env_ids = range(self.num_envs)
+        infos: Dict[str, Dict] = {i: {} for i in self.single_observation_spaces}
+        for env_num, info in zip(env_ids, env_infos):
+            for i in self.single_observation_spaces:
+                infos[i] = self._add_info(infos[i], info[i], env_num)
+        return infos
+
+    def _receive(self, env_ids: Sequence[int] | None = None) -> List[Any]:
+        if env_ids is None:
+            env_ids = range(self.num_envs)
+        if not env_ids:
+            return []
+        results, successes = zip(
+            *[self.parent_pipes[env_num].recv() for env_num in env_ids]
+        )
+        if not all(successes):
+            errors = []
+            for env_num, result, success in zip(env_ids, results, successes):
+                if not success:
+                    self._failed_env_ids.add(env_num)
+                    errors.append(result)
+            raise RuntimeError(f"Error in sub-environment worker: {errors}")
+        return list(results)
+
+    def _check_spaces(self) -> bool:
+        observation_spaces = self.call("observation_spaces")
+        action_spaces = self.call("action_spaces")
+        for env_obs_spaces, env_act_spaces in zip(observation_spaces, action_spaces):
+            for i in self.single_observation_spaces:
+                if (
+                    i not in env_obs_spaces
+                    or env_obs_spaces[i] != self.single_observation_spaces[i]
+                ):
+                    raise RuntimeError(
+                        "Some environments have an observation space different from "
+                        f"`{self.single_observation_spaces[i]}`. In order to batch "
+                        "observations, the observation spaces from all environments "
+                        "must be equal."
+                    )
+
+                if (
+                    i not in env_act_spaces
+                    or env_act_spaces[i] != self.single_action_spaces[i]
+                ):
+                    raise RuntimeError(
+                        "Some environments have an action space different from "
+                        f"`{self.single_action_spaces[i]}`. In order to batch actions, "
+                        "the action spaces from all environments must be equal."
+                    )
+
+        return True
+
+    def __del__(self):
+        if not getattr(self, "closed", True):
+            self.close()
+
+
+def _numba_threads_started() -> bool:
+    """Check whether numba's threading layer has been started in this process."""
+    numba = sys.modules.get("numba")
+    if numba is None:
+        return False
+    try:
+        numba.threading_layer()
+    except ValueError:
+        return False
+    return True
+
+
+def _shared_memory_views(
+    shared_memory: Dict[str, Any],
+    observation_spaces: Dict[str, spaces.Space],
+    action_spaces: Dict[str, spaces.Space],
+    num_envs: int,
+) -> Tuple[Dict[str, Any], ...]:
+    """Get numpy views of the observations, actions, rewards and signals memory."""
+    agent_ids = tuple(observation_spaces)
+
+    def agent_views(memory, dtype) -> Dict[str, np.ndarray]:
+        arr = np.frombuffer(memory, dtype=dtype).reshape(len(agent_ids), num_envs)
+        return {i: arr[idx] for idx, i in enumerate(agent_ids)}
+
+    observations = {
+        i: read_from_shared_memory(space, shared_memory["observations"][i], n=num_envs)
+        for i, space in observation_spaces.items()
+    }
+    actions = {
+        i: read_from_shared_memory(space, shared_memory["actions"][i], n=num_envs)
+        for i, space in action_spaces.items()
+    }
+    return (
+        observations,
+        actions,
+        agent_views(shared_memory["rewards"], np.float32),
+        agent_views(shared_memory["terminateds"], np.bool_),
+        agent_views(shared_memory["truncateds"], np.bool_),
+        np.frombuffer(shared_memory["all_dones"], dtype=np.bool_),
+    )
+
+
+def _write_batch(
+    space: spaces.Space,
+    values: Any,
+    view: Any,
+    shared_memory: Any,
+    env_ids: Sequence[int],
+):
+    """Write batch of values for the given sub-environments to shared memory."""
+    if isinstance(view, np.ndarray):
+        values = np.asarray(values, dtype=view.dtype).reshape(view.shape)
+        view[env_ids] = values[env_ids]
+    else:
+        for env_num in env_ids:
+            write_to_shared_memory(space, env_num, values[env_num], shared_memory)
+
+
+def _index(view: Any, index: int) -> Any:
+    """Get copy of the value for a single sub-environment from shared memory view."""
+    if isinstance(view, tuple):
+        return tuple(_index(v, index) for v in view)
+    if isinstance(view, dict):
+        return {k: _index(v, index) for k, v in view.items()}
+    return view[index].copy()
+
+
+def _write_obs(
+    env: posggym.Env, index: int, obs: Dict[str, Any], shared_memory: Dict[str, Any]
+):
+    for i, space in env.observation_spaces.items():
+        write_to_shared_memory(space, index, obs[i], shared_memory["observations"][i])
+
+
+def _worker_reset(
+    env: posggym.Env,
+    index: int,
+    shared_memory: Dict[str, Any],
+    views: Tuple[Dict[str, Any], ...],
+    data: Dict[str, Any],
+) -> Dict[str, Dict]:
+    _, _, _, terminateds, truncateds, all_dones = views
+    obs, info = env.reset(**data)
+    _write_obs(env, index, obs, shared_memory)
+    for i in terminateds:
+        terminateds[i][index] = False
+        truncateds[i][index] = False
+    all_dones[index] = False
+    return info
+
+
+def _worker_step(
+    env: posggym.Env,
+    index: int,
+    shared_memory: Dict[str, Any],
+    views: Tuple[Dict[str, Any], ...],
+    data: None,
+) -> Dict[str, Dict]:
+    _, actions, rewards, terminateds, truncateds, all_dones = views
+    action = {i: _index(actions[i], index) for i in actions}
+    obs, rews, terms, truncs, all_done, info = env.step(action)
+    if all_done:
+        old_obs, old_info = obs, info
+        obs, info = env.reset()
+        for i in old_obs:
+            info[i]["final_observation"] = old_obs[i]
+            info[i]["final_info"] = old_info[i]
+    _write_obs(env, index, obs, shared_memory)
+    for i in rewards:
+        rewards[i][index] = rews[i]
+        terminateds[i][index] = terms[i]
+        truncateds[i][index] = truncs[i]
+    all_dones[index] = all_done
+    return info
+
+
+def _worker_call(
+    env: posggym.Env,
+    index: int,
+    shared_memory: Dict[str, Any],
+    views: Tuple[Dict[str, Any], ...],
+    data: Tuple[str, Tuple, Dict[str, Any]],
+) -> Any:
+    name, args, kwargs = data
+    attr = getattr(env, name)
+    return attr(*args, **kwargs) if callable(attr) else attr
+
+
+_WORKER_COMMANDS = {
+    "reset": _worker_reset,
+    "step": _worker_step,
+    "call": _worker_call,
+}
+
+
+def _worker(
+    index: int,
+    env_fn: CloudpickleWrapper,
+    pipe: Any,
+    parent_pipe: Any,
+    shared_memory: Dict[str, Any],
+    num_envs: int,
+):
+    env = env_fn()
+    parent_pipe.close()
+    views = _shared_memory_views(
+        shared_memory, env.observation_spaces, env.action_spaces, num_envs
+    )
+
+    try:
+        while True:
+            command, data = pipe.recv()
+            if command == "close":
+                pipe.send((None, True))
+                break
+            if command not in _WORKER_COMMANDS:
+                raise RuntimeError(f"Received unknown command `{command}`.")
+            result = _WORKER_COMMANDS[command](env, index, shared_memory, views, data)
+            pipe.send((result, True))
+    except (KeyboardInterrupt, Exception) as e:
+        # worker exits after reporting the error
+        pipe.send((f"{type(e).__name__}: {e}", False))
+    finally:
+        env.close()
@@ -9,7 +9,7 @@ https://github.com/Farama-Foundation/Gymnasium/blob/main/gymnasium/vector/sync_v
 from __future__ import annotations
 
 from copy import deepcopy
-from typing import Any, Callable, Dict, Iterable, List, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple, cast
 
 import numpy as np
 from gymnasium.vector.utils import concatenate, create_empty_array
@@ -114,6 +114,8 @@ class SyncVectorEnv(posggym.Env):
         }
         self._all_dones = np.zeros((self.num_envs,), dtype=np.bool_)
         self._actions = {i: None for i in self.single_action_spaces}
+        # latest observations of each sub-environment, None until it is reset/stepped
+        self._env_observations: List[Dict[str, Any] | None] = [None for _ in self.envs]
 
     def reset(
         self,
@@ -138,6 +140,7 @@ class SyncVectorEnv(posggym.Env):
 
         for env_num, (env, s) in enumerate(zip(self.envs, seed)):
             obs, info = env.reset(seed=s, options=options)
+            self._env_observations[env_num] = obs
             for i in self.single_observation_spaces:
                 observations[i].append(obs[i])
                 infos[i] = self._add_info(infos[i], info[i], env_num)
@@ -151,13 +154,17 @@ class SyncVectorEnv(posggym.Env):
 
         return (deepcopy(self.observations) if self.copy else self.observations), infos
 
-    def step(self, actions):
+    def step(self, actions, env_ids: Sequence[int] | None = None):
         """Take a step in all environments with the given actions.
 
         If any environment is done, then it is reset before taking the next step. The
         final observation and info of the previous environment is stored in the info
         dictionary under the keys ``final_observation`` and ``final_info``.
 
+        If ``env_ids`` is given then only those sub-environments are stepped. The other
+        sub-environments keep their current observation, have a reward of ``0`` and
+        are not done, and have no info.
+
 
         Arguments
         ---------
@@ -165,6 +172,9 @@ class SyncVectorEnv(posggym.Env):
             dict mapping agent ID to batch of actions for that agent, with one action
             for each environment. So should be a dict of arrays or lists, with each
             array/list having length equal to the number of environments.
+        env_ids
+            indices of the sub-environments to step. If ``None`` (default), all
+            sub-environments are stepped.
 
         Returns
         -------
@@ -194,10 +204,28 @@ class SyncVectorEnv(posggym.Env):
         The batched environment step results.
 
         """
-        observations = {i: [] for i in self.single_observation_spaces}
         infos = {i: {} for i in self.single_observation_spaces}
+        if env_ids is None:
+            env_ids = range(self.num_envs)
+        else:
+            not_reset = {
+                env_num
+                for env_num, obs in enumerate(self._env_observations)
+                if obs is None
+            }.difference(env_ids)
+            if not_reset:
+                raise RuntimeError(
+                    f"Sub-environments {sorted(not_reset)} have not been reset, call "
+                    "`reset` before stepping only some of the sub-environments."
+                )
+            for i in self.single_observation_spaces:
+                self._rewards[i][:] = 0
+                self._terminateds[i][:] = False
+                self._truncateds[i][:] = False
+            self._all_dones[:] = False
 
-        for env_num, env in enumerate(self.envs):
+        for env_num in env_ids:
+            env = self.envs[env_num]
             action = {i: actions[i][env_num] for i in self.single_action_spaces}
 
             observation, rewards, terminateds, truncateds, all_done, info = env.step(
@@ -211,8 +239,8 @@ class SyncVectorEnv(posggym.Env):
                     info[i]["final_observation"] = old_observation[i]
                     info[i]["final_info"] = old_info[i]
 
+            self._env_observations[env_num] = observation
             for i in self.single_observation_spaces:
-                observations[i].append(observation[i])
                 infos[i] = self._add_info(infos[i], info[i], env_num)
                 self._rewards[i][env_num] = rewards[i]
                 self._terminateds[i][env_num] = terminateds[i]
@@ -220,10 +248,12 @@ class SyncVectorEnv(posggym.Env):
 
             self._all_dones[env_num] = all_done
 
+        # all sub-environments were either stepped above or checked to be reset
+        env_observations = cast(List[Dict[str, Any]], self._env_observations)
         for i in self.single_observation_spaces:
             self.observations[i] = concatenate(
                 self.single_observation_spaces[i],
-                observations[i],
+                [obs[i] for obs in env_observations],
                 self.observations[i],
             )
 
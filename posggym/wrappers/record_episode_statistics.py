@@ -79,8 +79,8 @@ class RecordEpisodeStatistics(posggym.Wrapper):
         super().__init__(env)
         self._deque_size = deque_size
 
-        self.num_envs = getattr(env, "num_envs", 1)
-        self.is_vector_env = getattr(env, "is_vector_env", False)
+        self.num_envs = getattr(env.unwrapped, "num_envs", 1)
+        self.is_vector_env = getattr(env.unwrapped, "is_vector_env", False)
 
         self.episode_count = 0
         self.episode_start_times = np.zeros(self.num_envs, np.float32)
@@ -112,7 +112,7 @@ class RecordVideo(Wrapper):
         self.recording = False
         self.episode_done = False
         self.recorded_frames = 0
-        self.is_vector_env = getattr(env, "is_vector_env", False)
+        self.is_vector_env = getattr(env.unwrapped, "is_vector_env", False)
 
     def reset(self, **kwargs):
         observations = super().reset(**kwargs)
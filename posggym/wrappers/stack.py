@@ -92,8 +92,11 @@ class StackEnv(posggym.Wrapper):
     def __init__(self, env: posggym.Env):
         super().__init__(env)
 
-        self.num_envs = getattr(env, "num_envs", 1)
-        self.is_vector_env = getattr(env, "is_vector_env", False)
+        self.num_envs = getattr(env.unwrapped, "num_envs", 1)
+        self.is_vector_env = getattr(env.unwrapped, "is_vector_env", False)
+        if self.is_vector_env:
+            self.single_observation_spaces = env.unwrapped.single_observation_spaces
+            self.single_action_spaces = env.unwrapped.single_action_spaces
 
         agent_0_obs_space = env.observation_spaces[env.possible_agents[0]]
         for obs_space in env.observation_spaces.values():
@@ -0,0 +1,72 @@
+"""Tests for the heuristic agents in the level based foraging environment."""
+
+import numpy as np
+import posggym
+import posggym.agents as pga
+import pytest
+from posggym.agents.grid_world.level_based_foraging import _fast
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 4, 5])
+def test_sample_action_batch(n):
+    """Check batch sampled actions are valid for each policy state."""
+    env = posggym.make(
+        "LevelBasedForaging-v3", num_agents=3, size=10, max_food=8, sight=3
+    )
+    pi_id = f"LevelBasedForaging-v3/H{n}-v0"
+    policy = pga.make(pi_id, env.model, agent_id=env.possible_agents[0])
+    policy.reset(seed=42)
+
+    states = [policy.get_initial_state()]
+    for seed in range(20):
+        obs, _ = env.reset(seed=seed)
+        state = policy.get_next_state(None, obs[policy.agent_id], states[0])
+        states.append(state)
+
+    actions = policy.sample_action_batch(states)
+    assert actions.shape == (len(states),)
+    for a, state in zip(actions, states):
+        assert a in state["possible_actions"]
+
+
+@pytest.mark.parametrize("closest", [True, False])
+@pytest.mark.parametrize("max_level", [-1, 1, 2])
+def test_select_food(closest, max_level):
+    """Check compiled food selection matches brute force selection."""
+    rng = np.random.default_rng(42)
+    for _ in range(50):
+        food_arr = rng.integers(0, 5, size=(6, 3), dtype=np.int32)
+        food_arr[rng.random(6) < 0.3, :2] = -1
+        valid = [
+            (int(y), int(x), (y - 2) ** 2 + (x - 2) ** 2)
+            for y, x, level in food_arr
+            if x != -1 and (max_level < 0 or level <= max_level)
+        ]
+        out = np.empty(len(food_arr), dtype=np.int64)
+        num_selected = _fast.select_food(2, 2, food_arr, max_level, closest, out)
+        if not valid:
+            assert num_selected == 0
+            continue
+        best = (min if closest else max)(d for _, _, d in valid)
+        ties = [(fy, fx) for fy, fx, d in valid if d == best]
+        assert [tuple(food_arr[i, :2]) for i in out[:num_selected]] == ties
+
+
+def test_parse_obs_reused_buffer():
+    """Check obs arrays updated in place are re-parsed and not shared."""
+    env = posggym.make(
+        "LevelBasedForaging-v3", num_agents=2, size=10, max_food=4, sight=3
+    )
+    agent_id = env.possible_agents[0]
+    policy = pga.make("LevelBasedForaging-v3/H1-v0", env.model, agent_id=agent_id)
+    obs_0, _ = env.reset(seed=0)
+    obs_1, _ = env.reset(seed=1)
+    assert not np.array_equal(obs_0[agent_id], obs_1[agent_id])
+
+    buffer = np.array(obs_0[agent_id], dtype=np.int32)
+    agent_obs, food_obs = policy._parse_obs(buffer)
+    assert not np.shares_memory(agent_obs, buffer)
+    buffer[:] = obs_1[agent_id]
+    agent_obs, food_obs = policy._parse_obs(buffer)
+    expected = np.asarray(obs_1[agent_id]).reshape(-1, 3)
+    assert np.array_equal(np.concatenate([agent_obs, food_obs]), expected)
@@ -0,0 +1,161 @@
+"""Specific tests for the MultiAccessBroadcastChannel environment."""
+from itertools import product
+
+import numpy as np
+import pytest
+from posggym.envs.classic.mabc import FULL, NOSEND, SEND, MABCModel
+
+
+def test_step_batch():
+    """Check batched step matches the scalar model over all states and actions."""
+    model = MABCModel(
+        num_nodes=3, fill_probs=(0.9, 0.5, 0.1), init_buffer_dist=(1.0, 1.0, 1.0)
+    )
+    model.seed(42)
+
+    states, actions = zip(
+        *product(
+            product(*[[0, 1]] * 3),
+            product(*[[0, 1]] * 3),
+        )
+    )
+    states = np.array(states, dtype=np.uint8)
+    actions = np.array(actions, dtype=np.uint8)
+    next_states, obs, rewards = model.step_batch(states, actions)
+
+    assert next_states.shape == obs.shape == states.shape
+    assert rewards.shape == (len(states),)
+    for s, a, s_next, r in zip(states, actions, next_states, rewards):
+        expected_r = model.reward_fn(tuple(s), {str(i): a[i] for i in range(3)})
+        assert r == expected_r[0]
+        # full buffers stay full if node does not send
+        assert all(
+            s_next[i] == FULL for i in range(3) if s[i] == FULL and a[i] == NOSEND
+        )
+
+    init_states = model.sample_initial_state_batch(16)
+    assert init_states.shape == (16, 3)
+    assert np.all(init_states == FULL)
+
+
+def test_step_batch_out(monkeypatch):
+    """Check compiled and NumPy batched steps match, with and without `out`."""
+    from posggym.envs.classic import _mabc_fast
+
+    model = MABCModel(
+        num_nodes=3, fill_probs=(0.9, 0.5, 0.1), init_buffer_dist=(1.0,) * 3
+    )
+    rng = np.random.default_rng(0)
+    states = rng.integers(0, 2, (64, 3), dtype=np.uint8)
+    actions = rng.integers(0, 2, (64, 3), dtype=np.uint8)
+
+    results = []
+    for numba_available in (_mabc_fast.NUMBA_AVAILABLE, False):
+        monkeypatch.setattr(_mabc_fast, "NUMBA_AVAILABLE", numba_available)
+        model.seed(42)
+        results.append(model.step_batch(states, actions))
+
+        out = (
+            np.empty_like(states),
+            np.empty_like(states),
+            np.empty(len(states), np.float64),
+        )
+        model.seed(42)
+        returned = model.step_batch(states, actions, out=out)
+        assert all(r is o for r, o in zip(returned, out))
+        results.append(out)
+
+    for result in results[1:]:
+        for actual, expected in zip(result, results[0]):
+            assert np.array_equal(actual, expected)
+
+
+def test_jax_batch_rollout():
+    """Check jax rollouts give rewards consistent with the scalar model."""
+    jax = pytest.importorskip("jax")
+    from posggym.envs.classic import mabc_jax
+
+    model = MABCModel()
+    keys = jax.random.split(jax.random.PRNGKey(0), 4)
+    actions = np.random.default_rng(0).integers(0, 2, (4, 20, 2), dtype=np.uint8)
+    states, obs, rewards = mabc_jax.batch_rollout(
+        keys, actions, *mabc_jax.model_params(model)
+    )
+
+    assert states.shape == obs.shape == actions.shape
+    assert rewards.shape == (4, 20)
+    for b in range(4):
+        for t in range(1, 20):
+            a = {str(i): int(actions[b, t, i]) for i in range(2)}
+            expected_r = model.reward_fn(tuple(int(s) for s in states[b, t - 1]), a)
+            assert rewards[b, t] == expected_r[0]
+
+
+def test_step_batch_packed():
+    """Check bit-packed batched step matches the unpacked batched step."""
+    model = MABCModel(
+        num_nodes=3, fill_probs=(0.9, 0.5, 0.1), init_buffer_dist=(1.0, 1.0, 1.0)
+    )
+    states, actions = zip(*product(product(*[[0, 1]] * 3), product(*[[0, 1]] * 3)))
+    states = np.array(states, dtype=np.uint8)
+    actions = np.array(actions, dtype=np.uint8)
+
+    model.seed(42)
+    next_states, obs, rewards = model.step_batch(states, actions)
+    model.seed(42)
+    packed_next_states, packed_obs, packed_rewards = model.step_batch_packed(
+        model.pack_batch(states),
+        model.pack_batch(actions == SEND),
+    )
+
+    assert np.array_equal(model.unpack_batch(packed_next_states), next_states)
+    assert np.array_equal(model.unpack_batch(packed_obs), obs)
+    assert np.array_equal(packed_rewards, rewards)
+
+
+def test_step_batch_table():
+    """Check table-based batched step matches the bit-packed batched step."""
+    # deterministic fills and observations, so both methods must agree exactly
+    model = MABCModel(
+        num_nodes=3,
+        fill_probs=(1.0, 0.0, 0.0),
+        observation_prob=1.0,
+        init_buffer_dist=(1.0, 1.0, 1.0),
+    )
+    model.seed(42)
+    states, send = np.meshgrid(np.arange(8), np.arange(8))
+    states = states.ravel().astype(np.uint64)
+    send = send.ravel().astype(np.uint64)
+
+    expected = model.step_batch_packed(states, send)
+    for actual, expected_v in zip(model.step_batch_table(states, send), expected):
+        assert np.array_equal(actual, expected_v)
+
+    # check next state distribution for a stochastic model
+    model = MABCModel(fill_probs=(0.9, 0.1))
+    model.seed(42)
+    num_envs = 10000
+    next_states, _, _ = model.step_batch_table(
+        np.zeros(num_envs, np.uint64), np.zeros(num_envs, np.uint64)
+    )
+    freqs = np.bincount(next_states.astype(np.intp), minlength=4) / num_envs
+    assert np.allclose(freqs, [0.1 * 0.9, 0.9 * 0.9, 0.1 * 0.1, 0.9 * 0.1], atol=0.02)
+
+
+def test_rollout_batch():
+    """Check batched rollouts give rewards consistent with the scalar model."""
+    model = MABCModel()
+    model.seed(42)
+    init_states = model.sample_initial_state_batch(4)
+    actions = np.random.default_rng(0).integers(0, 2, (4, 20, 2), dtype=np.uint8)
+    states, obs, rewards = model.rollout_batch(init_states, actions)
+
+    assert states.shape == obs.shape == actions.shape
+    assert rewards.shape == (4, 20)
+    for b in range(4):
+        prev_state = init_states[b]
+        for t in range(20):
+            a = {str(i): int(actions[b, t, i]) for i in range(2)}
+            expected_r = model.reward_fn(tuple(int(s) for s in prev_state), a)
+            assert rewards[b, t] == expected_r[0]
+            prev_state = states[b, t]
@@ -1,8 +1,9 @@
 """Specific tests for the DroneTeamCapture-v0 environment."""
 
-import pytest
-
+import numpy as np
 import posggym
+import pytest
+from posggym.envs.continuous import _drone_team_capture_fast
 
 
 @pytest.mark.parametrize("num_pursuers", [2, 3, 4, 8])
@@ -36,5 +37,32 @@ def test_init_steps(num_pursuers: int):
     env.close()
 
 
+@pytest.mark.parametrize("observation_limit", [None, 200])
+def test_obs_implementations_match(observation_limit, monkeypatch):
+    """Check compiled, NumPy and stepped (cached) observations match."""
+    env = posggym.make(
+        "DroneTeamCapture-v0",
+        num_agents=4,
+        n_communicating_pursuers=2,
+        observation_limit=observation_limit,
+    )
+    env.reset(seed=35)
+    model = env.unwrapped.model
+
+    for _ in range(20):
+        step_obs, *_ = env.step({i: env.action_spaces[i].sample() for i in env.agents})
+        state = env.unwrapped.state
+        monkeypatch.setattr(_drone_team_capture_fast, "NUMBA_AVAILABLE", False)
+        expected = model._get_obs(state)
+        monkeypatch.undo()
+        actual = model._get_obs(state)
+        obs_array = model.get_obs_array(state)
+        assert obs_array.shape == (len(model.possible_agents), model.obs_dim)
+        for idx, (i, o_i) in enumerate(expected.items()):
+            assert np.array_equal(actual[i], o_i)
+            assert np.array_equal(step_obs[i], o_i)
+            assert np.array_equal(obs_array[idx], o_i)
+
+
 if __name__ == "__main__":
     test_init_steps(3)
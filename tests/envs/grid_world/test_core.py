@@ -99,6 +99,34 @@ class TestGrid:
             actual_coord = grid.get_next_coord(origin, move_dir, ignore_blocks)
             assert actual_coord == exp
 
+    def test_get_coords_within_dist(self):
+        """Test Grid.get_coords_within_dist function.
+
+        Test grid:
+
+        ...
+        .#.
+        ...
+
+        """
+        grid = Grid(3, 3, {(1, 1)})
+
+        expected_map = {
+            ((0, 0), 0, False, True): {(0, 0)},
+            ((0, 0), 0, False, False): set(),
+            ((0, 0), 1, False, True): {(0, 0), (0, 1), (1, 0)},
+            ((0, 0), 2, False, False): {(0, 1), (1, 0), (0, 2), (2, 0)},
+            ((0, 0), 2, True, False): {(0, 1), (1, 0), (0, 2), (2, 0), (1, 1)},
+            ((1, 1), 1, False, True): {(0, 1), (1, 0), (1, 2), (2, 1)},
+            ((1, 1), 1, True, True): {(1, 1), (0, 1), (1, 0), (1, 2), (2, 1)},
+            ((0, 1), 3, False, False): {(0, 0), (0, 2), (1, 0), (1, 2), (2, 0), (2, 2)},
+        }
+        for (origin, dist, ignore_blocks, include_origin), exp in expected_map.items():
+            coords = grid.get_coords_within_dist(
+                origin, dist, ignore_blocks, include_origin
+            )
+            assert coords == exp
+
     def test_get_connected_components(self):
         """Test Grid.get_connected_components function.
 
@@ -7,8 +7,10 @@ https://github.com/Farama-Foundation/Gymnasium/blob/v0.27.0/tests/test_core.py
 from typing import Any, Dict, Optional, Tuple
 
 import numpy as np
+import posggym
 import posggym.model as M
-from gymnasium.spaces import Box
+import pytest
+from gymnasium.spaces import Box, Discrete, MultiDiscrete, Tuple as TupleSpace
 from posggym import (
     ActionWrapper,
     DefaultEnv,
@@ -38,6 +40,25 @@ def test_posggym_env():
     assert env.spec is None
 
 
+def test_joint_spaces():
+    """Tests joint action and observation spaces of environment and wrappers."""
+    env = ExampleEnv()
+    num_agents = len(env.possible_agents)
+
+    joint_action_space = env.joint_action_space
+    assert joint_action_space == MultiDiscrete([2] * num_agents)
+    assert env.joint_observation_space == MultiDiscrete([2] * num_agents)
+    assert env.joint_action_space is joint_action_space
+
+    wrapper_env = Wrapper(env)
+    assert wrapper_env.joint_action_space == joint_action_space
+    wrapper_env.action_spaces = {
+        i: Discrete(idx + 2) for idx, i in enumerate(wrapper_env.possible_agents)
+    }
+    assert isinstance(wrapper_env.joint_action_space, TupleSpace)
+    assert env.joint_action_space is joint_action_space
+
+
 class ExampleWrapper(Wrapper):
     """An example testing wrapper."""
 
@@ -82,6 +103,12 @@ def test_posggym_wrapper():
     assert env.reward_ranges != wrapper_env.reward_ranges
 
     assert env.spec == wrapper_env.spec
+    assert wrapper_env.spec is None
+    env_spec = posggym.spec("MultiAccessBroadcastChannel-v0")
+    env.spec = env_spec
+    assert wrapper_env.spec is env_spec
+    wrapper_env.spec = None
+    assert env.spec is None
 
     assert env.observation_spaces == wrapper_env.observation_spaces
     assert env.action_spaces == wrapper_env.action_spaces
@@ -91,6 +118,17 @@ def test_posggym_wrapper():
     assert env.action_spaces != wrapper_env.action_spaces
 
     assert wrapper_env.model is env.model
+    model = ExampleModel()
+    wrapper_env.model = model
+    assert env.model is model
+    assert wrapper_env.model is model
+
+    # non-API attributes are still forwarded to the wrapped env, but deprecated
+    env.custom_attr = "custom"
+    with pytest.warns(DeprecationWarning, match="env.unwrapped.custom_attr"):
+        assert wrapper_env.custom_attr == "custom"
+    with pytest.raises(AttributeError):
+        _ = wrapper_env._private_attr
 
 
 class ExampleRewardWrapper(RewardWrapper):
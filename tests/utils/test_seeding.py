@@ -36,6 +36,18 @@ def test_valid_seeds():
         assert seed == seed2
 
 
+def test_np_random_streams():
+    rngs, seed = seeding.np_random_streams(seed=0, num_streams=3)
+    assert seed == 0
+    assert len(rngs) == 3
+    samples = [rng.random() for rng in rngs]
+    assert len(set(samples)) == 3
+
+    # each stream depends only on the seed and its index
+    rngs2, _ = seeding.np_random_streams(seed=0, num_streams=2)
+    assert [rng.random() for rng in rngs2] == samples[:2]
+
+
 def test_rng_pickle():
     np_rng, _ = seeding.np_random(seed=0)
     pickled = pickle.dumps(np_rng)
@@ -0,0 +1,146 @@
+"""Tests for shared memory vectorized environment."""
+
+import multiprocessing as mp
+
+import numpy as np
+import pytest
+from posggym.vector import shared_vector_env
+from posggym.vector.shared_vector_env import SharedVectorEnv
+from posggym.vector.sync_vector_env import SyncVectorEnv
+from tests.vector.test_sync_vector_env import make_env
+
+
+# other tests initialize multi-threaded libraries (e.g. numba), which are not safe to
+# use with the default "fork" context
+CONTEXT = "forkserver"
+
+
+def test_create_shared_vector_env():
+    env_fns = [make_env("MultiAccessBroadcastChannel-v0", i) for i in range(8)]
+    env = SharedVectorEnv(env_fns, context=CONTEXT)
+    env.close()
+    assert env.num_envs == 8
+
+
+@pytest.mark.parametrize(
+    "env_id", ["MultiAccessBroadcastChannel-v0", "DrivingContinuous-v0"]
+)
+def test_shared_vector_env_matches_sync_vector_env(env_id):
+    sync_env = SyncVectorEnv([make_env(env_id, i) for i in range(4)])
+    shared_env = SharedVectorEnv(
+        [make_env(env_id, i) for i in range(4)], context=CONTEXT
+    )
+
+    sync_obs, _ = sync_env.reset(seed=26)
+    shared_obs, _ = shared_env.reset(seed=26)
+    for i in sync_env.possible_agents:
+        assert np.array_equal(sync_obs[i], shared_obs[i])
+
+    for _ in range(10):
+        actions = {
+            i: act_space.sample() for i, act_space in sync_env.action_spaces.items()
+        }
+        sync_step = sync_env.step(actions)
+        shared_step = shared_env.step(actions)
+        for sync_output, shared_output in zip(sync_step[:4], shared_step[:4]):
+            for i in sync_env.possible_agents:
+                assert shared_output[i].dtype == sync_output[i].dtype
+                assert np.array_equal(sync_output[i], shared_output[i])
+        assert np.array_equal(sync_step[4], shared_step[4])
+
+    assert shared_env.agents == sync_env.agents
+    sync_env.close()
+    shared_env.close()
+
+
+def test_step_env_ids_shared_vector_env():
+    env_id = "MultiAccessBroadcastChannel-v0"
+    sync_env = SyncVectorEnv([make_env(env_id, i) for i in range(4)])
+    shared_env = SharedVectorEnv(
+        [make_env(env_id, i) for i in range(4)], context=CONTEXT
+    )
+    sync_env.reset(seed=26)
+    shared_env.reset(seed=26)
+
+    for env_ids in [[1, 3], [0], [0, 1, 2, 3]]:
+        actions = {
+            i: act_space.sample() for i, act_space in sync_env.action_spaces.items()
+        }
+        sync_step = sync_env.step(actions, env_ids=env_ids)
+        shared_step = shared_env.step(actions, env_ids=env_ids)
+        for sync_output, shared_output in zip(sync_step[:4], shared_step[:4]):
+            for i in sync_env.possible_agents:
+                assert np.array_equal(sync_output[i], shared_output[i])
+        assert np.array_equal(sync_step[4], shared_step[4])
+
+    assert shared_env.state == sync_env.state
+    sync_env.close()
+    shared_env.close()
+
+
+def test_double_buffered_shared_vector_env():
+    env_id = "MultiAccessBroadcastChannel-v0"
+    sync_env = SyncVectorEnv([make_env(env_id, i) for i in range(4)])
+    shared_env = SharedVectorEnv(
+        [make_env(env_id, i) for i in range(4)], copy=False, context=CONTEXT
+    )
+    sync_env.reset(seed=26)
+    shared_env.reset(seed=26)
+
+    groups = [[0, 1], [2, 3]]
+    actions = [
+        {i: act_space.sample() for i, act_space in sync_env.action_spaces.items()}
+        for _ in groups
+    ]
+    for env_ids, group_actions in zip(groups, actions):
+        shared_env.step_async(group_actions, env_ids=env_ids)
+    with pytest.raises(RuntimeError):
+        shared_env.step_async(actions[0], env_ids=groups[0])
+
+    for t in range(10):
+        env_ids = groups[t % 2]
+        sync_step = sync_env.step(actions[t % 2], env_ids=env_ids)
+        shared_step = shared_env.step_wait()
+        for sync_output, shared_output in zip(sync_step[:4], shared_step[:4]):
+            for i in sync_env.possible_agents:
+                assert np.array_equal(
+                    sync_output[i][env_ids], shared_output[i][env_ids]
+                )
+        assert np.array_equal(sync_step[4][env_ids], shared_step[4][env_ids])
+
+        actions[t % 2] = {
+            i: act_space.sample() for i, act_space in sync_env.action_spaces.items()
+        }
+        shared_env.step_async(actions[t % 2], env_ids=env_ids)
+
+    sync_env.close()
+    shared_env.close()
+
+
+def test_close_after_worker_error_shared_vector_env():
+    env_fns = [make_env("MultiAccessBroadcastChannel-v0", i) for i in range(4)]
+    env = SharedVectorEnv(env_fns, context=CONTEXT)
+    env.reset(seed=26)
+
+    # workers exit after reporting an error
+    with pytest.raises(RuntimeError, match="AttributeError"):
+        env.call("not_an_attribute")
+
+    env.close()
+    assert env.closed
+    assert not any(process.is_alive() for process in env.processes)
+
+
+@pytest.mark.skipif(
+    mp.get_context().get_start_method() != "fork",
+    reason="only the 'fork' start method is replaced",
+)
+def test_default_context_after_numba_threads_shared_vector_env(monkeypatch):
+    monkeypatch.setattr(shared_vector_env, "_numba_threads_started", lambda: True)
+    env_fns = [make_env("MultiAccessBroadcastChannel-v0", i) for i in range(2)]
+    env = SharedVectorEnv(env_fns)
+    env.reset(seed=27)
+    env.close()
+    assert not any(
+        isinstance(process, mp.context.ForkProcess) for process in env.processes
+    )
@@ -159,3 +159,36 @@ def test_call_sync_vector_env():
     assert len(states) == 4
     for i in range(4):
         assert isinstance(states[i], tuple)
+
+
+def test_step_env_ids_sync_vector_env():
+    env_fns = [make_env("MultiAccessBroadcastChannel-v0", i) for i in range(4)]
+    env = SyncVectorEnv(env_fns)
+    observations, _ = env.reset(seed=26)
+    states = env.state
+
+    actions = {i: act_space.sample() for i, act_space in env.action_spaces.items()}
+    next_observations, rewards, _, _, all_done, _ = env.step(actions, env_ids=[1, 3])
+    next_states = env.state
+    env.close()
+
+    for env_num in [0, 2]:
+        assert next_states[env_num] == states[env_num]
+        assert not all_done[env_num]
+        for i in env.possible_agents:
+            assert next_observations[i][env_num] == observations[i][env_num]
+            assert rewards[i][env_num] == 0
+
+
+def test_step_env_ids_before_reset_sync_vector_env():
+    env_fns = [make_env("MultiAccessBroadcastChannel-v0", i) for i in range(4)]
+    env = SyncVectorEnv(env_fns)
+    actions = {i: act_space.sample() for i, act_space in env.action_spaces.items()}
+
+    with pytest.raises(RuntimeError, match=r"\[0, 2\] have not been reset"):
+        env.step(actions, env_ids=[1, 3])
+
+    # stepping all sub-environments gives every one an observation
+    env.step(actions)
+    env.step(actions, env_ids=[1, 3])
+    env.close()